@@ -0,0 +1,29 @@
+"""
+Request middleware.
+"""
+
+from django.conf import settings
+from django.http import JsonResponse
+
+
+class MaxRequestSizeMiddleware:
+    """
+    Reject requests whose declared body exceeds ``MAX_REQUEST_BYTES``.
+
+    The check uses the Content-Length header, so an oversized upload is
+    answered with 413 before any of its body is read or spooled to disk.
+    Serializers still validate the actual file size.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_bytes = settings.MAX_REQUEST_BYTES
+
+    def __call__(self, request):
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > self.max_bytes:
+            return JsonResponse({"error": "Request body too large."}, status=413)
+        return self.get_response(request)
@@ -0,0 +1,53 @@
+"""
+API renderers.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson when it is installed.
+
+    Falls back to DRF's stdlib-based renderer when orjson is missing or an
+    indented response is requested. Values orjson does not handle natively
+    (Decimal, lazy strings, and datetimes, to keep DRF's ``Z`` suffix) go
+    through DRF's encoder, non-string dict keys (such as the item indexes
+    in ListField errors) are written as strings, and U+2028/U+2029 are
+    escaped as ``JSONRenderer`` does. Anything orjson still refuses, such
+    as integers beyond 64 bits, is rendered by the stock renderer instead.
+
+    The output is equivalent JSON but not byte-identical to
+    ``JSONRenderer``'s:
+
+    - float exponents are written without ``+`` or zero padding
+      (``1e20`` and ``1e-7`` rather than ``1e+20`` and ``1e-07``);
+    - NaN and infinite floats are written as ``null``, where the stock
+      renderer (``STRICT_JSON``) raises.
+    """
+
+    _default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self._default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Line and paragraph separators end lines in JavaScript source
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
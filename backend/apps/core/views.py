@@ -1,5 +1,19 @@
 # apps/core/views.py
-from django.http import JsonResponse
+import json
 
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+
+# The health payload never changes, so it is serialized once at import time
+_HEALTH_BODY = json.dumps({"status": "ISOGUARD backend running"}).encode()
+
+
+# Kept synchronous: the project is served over WSGI (gunicorn), where an
+# async view would be wrapped in async_to_sync and cost more per probe.
+@csrf_exempt
+@require_GET
+@cache_control(no_store=True)
 def health_check(request):
-    return JsonResponse({"status": "ISOGUARD backend running"})
+    return HttpResponse(_HEALTH_BODY, content_type="application/json")
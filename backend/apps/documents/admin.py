@@ -1,7 +1,93 @@
 from django.contrib import admin
-from django.utils.html import format_html, mark_safe, escape
+from django.utils.html import format_html, format_html_join, mark_safe
+from bisect import bisect_right
 import json
+from types import MappingProxyType
 from .models import Document, DocumentChunk, AnalysisResult
+from .pagination import EstimatedCountPaginator
+from .search import (
+    analysis_search_vector,
+    chunk_search_vector,
+    full_text_search_enabled,
+    search_query,
+    update_search_vectors,
+)
+from .storage import stored_file_url
+
+
+# Badge colors per compliance status
+_BADGE_COLORS = MappingProxyType({
+    "compliant": "#28a745",       # Green
+    "partial": "#ffc107",          # Yellow
+    "non_compliant": "#dc3545",    # Red
+    "not_applicable": "#6c757d",   # Gray
+})
+_BADGE_DEFAULT_COLOR = "#6c757d"
+_BADGE_LABELS = MappingProxyType(dict(AnalysisResult.ComplianceStatus.choices))
+_BADGE_TMPL = (
+    '<span style="background-color: {color}; color: white; padding: 3px 8px; '
+    'border-radius: 4px; font-weight: bold;">{label}</span>'
+)
+
+# Score thresholds (percent); _SCORE_COLORS[i] applies from _SCORE_KEYS[i - 1] upwards
+_SCORE_KEYS = (50, 80)
+_SCORE_COLORS = (
+    "#dc3545",    # Red
+    "#ffc107",    # Yellow
+    "#28a745",    # Green
+)
+_SCORE_TMPL = '<span style="color: {color}; font-weight: bold;">{score}</span>'
+
+_CELL_STYLE = "padding: 4px 8px; border: 1px solid #ddd;"
+_JSON_ROW_TMPL = (
+    f"<tr><td style='{_CELL_STYLE}'><strong>{{}}</strong></td>"
+    f"<td style='{_CELL_STYLE}'>{{}}</td></tr>"
+)
+_JSON_ITEM_TMPL = "<li style='margin-bottom: 8px;'>{}</li>"
+
+
+def _score_color(score):
+    """Return the display color for a percentage score."""
+    return _SCORE_COLORS[bisect_right(_SCORE_KEYS, score)]
+
+
+def _format_percent(score):
+    """Format a 0-100 score with one decimal place."""
+    return format(score, ".1f") + "%"
+
+
+def _score_value_html(value):
+    """Render a JSON value, showing numeric 0-1 scores as colored percentages."""
+    if isinstance(value, (int, float)):
+        score = float(value) * 100
+        return format_html(_SCORE_TMPL, color=_score_color(score), score=_format_percent(score))
+    return str(value)
+
+
+class FullTextSearchMixin:
+    """
+    Admin search that adds the stored ``search_vector`` column on PostgreSQL.
+    
+    Rows matching the regular ``search_fields`` lookup are always returned;
+    on PostgreSQL, rows whose (GIN-indexed) search vector matches the term
+    are returned as well. Saving a row in the admin refreshes its vector
+    with ``search_vector_expression``.
+    """
+    
+    search_vector_expression = None
+    
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term and full_text_search_enabled():
+            results |= queryset.filter(search_vector=search_query(search_term))
+        return results, may_have_duplicates
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        update_search_vectors(
+            type(obj).objects.filter(pk=obj.pk),
+            self.search_vector_expression()
+        )
 
 
 class DocumentChunkInline(admin.TabularInline):
@@ -28,6 +114,8 @@ class DocumentAdmin(admin.ModelAdmin):
         "processed_at",
     ]
     list_filter = ["status", "file_type", "uploaded_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = ["name", "id"]
     readonly_fields = [
         "id",
@@ -59,7 +147,7 @@ class DocumentAdmin(admin.ModelAdmin):
 
 
 @admin.register(DocumentChunk)
-class DocumentChunkAdmin(admin.ModelAdmin):
+class DocumentChunkAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = [
         "id",
         "document",
@@ -69,7 +157,11 @@ class DocumentChunkAdmin(admin.ModelAdmin):
         "word_count",
     ]
     list_filter = ["document__file_type", "created_at"]
-    search_fields = ["content", "heading", "document__name"]
+    list_select_related = ("document",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    search_fields = ["heading", "document__name"]
+    search_vector_expression = staticmethod(chunk_search_vector)
     readonly_fields = [
         "id",
         "document",
@@ -99,7 +191,7 @@ class DocumentChunkAdmin(admin.ModelAdmin):
 
 
 @admin.register(AnalysisResult)
-class AnalysisResultAdmin(admin.ModelAdmin):
+class AnalysisResultAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = [
         "id",
         "checklist_title",
@@ -111,7 +203,11 @@ class AnalysisResultAdmin(admin.ModelAdmin):
         "analyzed_by",
     ]
     list_filter = ["status", "compliance_status", "checklist_id", "created_at"]
-    search_fields = ["checklist_title", "summary", "id"]
+    list_select_related = ("analyzed_by",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    search_fields = ["checklist_title", "id"]
+    search_vector_expression = staticmethod(analysis_search_vector)
     readonly_fields = [
         "id",
         "compliance_score_display",
@@ -186,50 +282,55 @@ class AnalysisResultAdmin(admin.ModelAdmin):
         }),
     )
     
+    # Columns needed to render the change-list; the large summary and JSON
+    # analysis fields are only loaded on the change form.
+    changelist_fields = (
+        "id",
+        "checklist_id",
+        "checklist_title",
+        "compliance_status",
+        "compliance_score",
+        "status",
+        "pdf_report",
+        "created_at",
+        "analyzed_by",
+    )
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match and resolver_match.url_name.endswith("_changelist"):
+            return queryset.only(*self.changelist_fields)
+        return queryset.prefetch_related("documents")
+    
     def compliance_status_badge(self, obj):
         """Display compliance status as a colored badge."""
         if not obj.compliance_status:
             return mark_safe('<span style="color: gray;">Pending</span>')
         
-        colors = {
-            "compliant": "#28a745",       # Green
-            "partial": "#ffc107",          # Yellow
-            "non_compliant": "#dc3545",    # Red
-            "not_applicable": "#6c757d",   # Gray
-        }
-        color = colors.get(obj.compliance_status, "#6c757d")
-        label = obj.get_compliance_status_display()
         return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 4px; font-weight: bold;">{}</span>',
-            color, label
+            _BADGE_TMPL,
+            color=_BADGE_COLORS.get(obj.compliance_status, _BADGE_DEFAULT_COLOR),
+            label=_BADGE_LABELS.get(obj.compliance_status, obj.compliance_status),
         )
     compliance_status_badge.short_description = "Compliance"
     compliance_status_badge.admin_order_field = "compliance_status"
     
     def compliance_score_display(self, obj):
         """Display compliance score as a percentage with color."""
-        score = obj.compliance_score * 100 if obj.compliance_score else 0
-        if score >= 80:
-            color = "#28a745"
-        elif score >= 50:
-            color = "#ffc107"
-        else:
-            color = "#dc3545"
-        score_text = f"{score:.1f}%"
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color, score_text
-        )
+        score = obj.compliance_score * 100
+        return format_html(_SCORE_TMPL, color=_score_color(score), score=_format_percent(score))
     compliance_score_display.short_description = "Score"
     compliance_score_display.admin_order_field = "compliance_score"
     
     def documents_list(self, obj):
         """Display linked documents as a list."""
-        docs = obj.documents.all()
-        if not docs:
-            return "No documents"
-        items = "<br>".join([f"• {escape(doc.name)}" for doc in docs])
-        return mark_safe(items)
+        # obj.documents is prefetched in get_queryset()
+        return format_html_join(
+            mark_safe("<br>"),
+            "• {}",
+            ((doc.name,) for doc in obj.documents.all())
+        ) or "No documents"
     documents_list.short_description = "Analyzed Documents"
     
     def _format_json_list(self, data):
@@ -238,8 +339,10 @@ class AnalysisResultAdmin(admin.ModelAdmin):
             return mark_safe('<span style="color: gray;">No data</span>')
         
         if isinstance(data, list):
-            items = "".join([f"<li style='margin-bottom: 8px;'>{escape(str(item))}</li>" for item in data])
-            return mark_safe(f"<ul style='margin: 0; padding-left: 20px;'>{items}</ul>")
+            return format_html(
+                "<ul style='margin: 0; padding-left: 20px;'>{}</ul>",
+                format_html_join("", _JSON_ITEM_TMPL, ((item,) for item in data))
+            )
         return format_html("<pre>{}</pre>", json.dumps(data, indent=2))
     
     def _format_json_dict(self, data):
@@ -248,21 +351,14 @@ class AnalysisResultAdmin(admin.ModelAdmin):
             return mark_safe('<span style="color: gray;">No data</span>')
         
         if isinstance(data, dict):
-            rows = ""
-            for key, value in data.items():
-                if isinstance(value, (int, float)):
-                    score = float(value) * 100
-                    if score >= 80:
-                        color = "#28a745"
-                    elif score >= 50:
-                        color = "#ffc107"
-                    else:
-                        color = "#dc3545"
-                    value_html = f'<span style="color: {color}; font-weight: bold;">{score:.1f}%</span>'
-                else:
-                    value_html = escape(str(value))
-                rows += f"<tr><td style='padding: 4px 8px; border: 1px solid #ddd;'><strong>{escape(str(key))}</strong></td><td style='padding: 4px 8px; border: 1px solid #ddd;'>{value_html}</td></tr>"
-            return mark_safe(f"<table style='border-collapse: collapse; width: 100%;'>{rows}</table>")
+            return format_html(
+                "<table style='border-collapse: collapse; width: 100%;'>{}</table>",
+                format_html_join(
+                    "",
+                    _JSON_ROW_TMPL,
+                    ((key, _score_value_html(value)) for key, value in data.items())
+                )
+            )
         return format_html("<pre>{}</pre>", json.dumps(data, indent=2))
     
     def findings_display(self, obj):
@@ -290,7 +386,7 @@ class AnalysisResultAdmin(admin.ModelAdmin):
         if obj.pdf_report:
             return format_html(
                 '<a href="{}" target="_blank" style="background-color: #dc3545; color: white; padding: 5px 15px; border-radius: 4px; text-decoration: none;">📄 Download PDF Report</a>',
-                obj.pdf_report.url
+                stored_file_url(obj.pdf_report)
             )
         return mark_safe('<span style="color: gray;">No PDF generated yet</span>')
     pdf_report_link.short_description = "PDF Report"
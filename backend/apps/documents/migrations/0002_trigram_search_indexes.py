@@ -0,0 +1,46 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Trigram GIN indexes backing the admin's icontains searches.
+# (index name, table, column)
+TRIGRAM_INDEXES = [
+    ("chunk_content_trgm", "documents_documentchunk", "content"),
+    ("chunk_heading_trgm", "documents_documentchunk", "heading"),
+    ("document_name_trgm", "documents_document", "name"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # gin_trgm_ops is PostgreSQL-only; SQLite development databases skip it.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS %s ON %s USING gin (%s gin_trgm_ops)" % (
+                schema_editor.quote_name(name),
+                schema_editor.quote_name(table),
+                schema_editor.quote_name(column),
+            )
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            "DROP INDEX IF EXISTS %s" % schema_editor.quote_name(name)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:20
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# GIN indexes over the stored tsvector columns. (index name, table)
+SEARCH_VECTOR_INDEXES = [
+    ("chunk_search_vector_gin", "documents_documentchunk"),
+    ("analysis_search_vector_gin", "documents_analysisresult"),
+]
+
+
+def create_search_vector_indexes(apps, schema_editor):
+    # Full-text search is PostgreSQL-only; SQLite keeps the plain admin search.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table in SEARCH_VECTOR_INDEXES:
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS %s ON %s USING gin (search_vector)" % (
+                schema_editor.quote_name(name),
+                schema_editor.quote_name(table),
+            )
+        )
+    
+    # Backfill vectors for rows created before this migration
+    schema_editor.execute(
+        "UPDATE documents_documentchunk SET search_vector = "
+        "setweight(to_tsvector('english', coalesce(heading, '')), 'A') || "
+        "to_tsvector('english', content)"
+    )
+    schema_editor.execute(
+        "UPDATE documents_analysisresult SET search_vector = "
+        "setweight(to_tsvector('english', checklist_title), 'A') || "
+        "to_tsvector('english', summary)"
+    )
+
+
+def drop_search_vector_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table in SEARCH_VECTOR_INDEXES:
+        schema_editor.execute(
+            "DROP INDEX IF EXISTS %s" % schema_editor.quote_name(name)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisresult',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='documentchunk',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_indexes, drop_search_vector_indexes),
+    ]
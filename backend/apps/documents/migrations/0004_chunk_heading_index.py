@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='documentchunk',
+            name='heading',
+            field=models.CharField(blank=True, db_index=True, max_length=500, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_chunk_heading_index'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analysisresult',
+            index=models.Index(fields=['status', '-created_at'], name='ar_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analysisresult',
+            index=models.Index(fields=['compliance_status', '-created_at'], name='ar_compliance_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analysisresult',
+            index=models.Index(condition=models.Q(('status', 'completed')), fields=['-created_at'], name='ar_completed_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status', '-uploaded_at'], name='doc_status_uploaded_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:24
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0005_filter_indexes'),
+    ]
+
+    # A regular column cannot be altered into a generated one, so it is re-added.
+    operations = [
+        migrations.RemoveField(
+            model_name='documentchunk',
+            name='char_count',
+        ),
+        migrations.AddField(
+            model_name='documentchunk',
+            name='char_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Length('content'), output_field=models.PositiveIntegerField()),
+        ),
+    ]
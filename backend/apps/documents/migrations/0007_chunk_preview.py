@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:27
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0006_generated_char_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentchunk',
+            name='preview',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Substr('content', 1, 100), output_field=models.CharField(max_length=100)),
+        ),
+    ]
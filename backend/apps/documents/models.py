@@ -1,5 +1,7 @@
 import uuid
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Length, Substr
 from apps.users.models import User
 
 
@@ -46,6 +48,8 @@ class Document(models.Model):
     # Timestamps
     uploaded_at = models.DateTimeField(auto_now_add=True)
     processed_at = models.DateTimeField(blank=True, null=True)
+    # Bumped on every save; used as the validator for conditional GETs
+    updated_at = models.DateTimeField(auto_now=True)
     
     # Optional: Link to user who uploaded
     uploaded_by = models.ForeignKey(
@@ -64,12 +68,39 @@ class Document(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["file_type"]),
             models.Index(fields=["uploaded_at"]),
+            models.Index(fields=["status", "-uploaded_at"], name="doc_status_uploaded_idx"),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.file_type})"
 
 
+# Number of content characters shown in chunk list previews
+CHUNK_PREVIEW_LENGTH = 100
+
+# Columns read by the chunk listing; everything else (content, search_vector,
+# offsets) stays in the database.
+CHUNK_LIST_FIELDS = ("id", "chunk_index", "heading", "char_count", "word_count", "preview")
+
+
+class DocumentChunkQuerySet(models.QuerySet):
+    
+    def with_preview(self):
+        """
+        Load only the listing columns, including the stored ``preview``.
+        
+        ``preview_truncated`` is derived from the generated ``char_count`` column so
+        serializers can add an ellipsis without looking at the content.
+        """
+        return self.only(*CHUNK_LIST_FIELDS).annotate(
+            preview_truncated=models.Case(
+                models.When(char_count__gt=CHUNK_PREVIEW_LENGTH, then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+
+
 class DocumentChunk(models.Model):
     """
     Represents a semantic chunk extracted from a document.
@@ -97,16 +128,32 @@ class DocumentChunk(models.Model):
         help_text="Ending character position in original document"
     )
     
-    # Chunk metadata
-    char_count = models.PositiveIntegerField(default=0)
+    # Chunk metadata: the database computes char_count and preview from content
+    # on write; word_count is set by the chunking pipeline (bulk_create) and
+    # recomputed by save() for individually saved chunks.
+    char_count = models.GeneratedField(
+        expression=Length("content"),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+    )
+    preview = models.GeneratedField(
+        expression=Substr("content", 1, CHUNK_PREVIEW_LENGTH),
+        output_field=models.CharField(max_length=CHUNK_PREVIEW_LENGTH),
+        db_persist=True,
+    )
     word_count = models.PositiveIntegerField(default=0)
     
     # Optional: heading or section title if detected
-    heading = models.CharField(max_length=500, blank=True, null=True)
+    heading = models.CharField(max_length=500, blank=True, null=True, db_index=True)
+    
+    # Full-text search document (PostgreSQL only, see apps.documents.search)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = DocumentChunkQuerySet.as_manager()
+    
     class Meta:
         ordering = ["document", "chunk_index"]
         unique_together = ["document", "chunk_index"]
@@ -119,9 +166,13 @@ class DocumentChunk(models.Model):
         return f"Chunk {self.chunk_index} of {self.document.name}: {preview}"
     
     def save(self, *args, **kwargs):
-        # Auto-calculate counts
-        self.char_count = len(self.content)
-        self.word_count = len(self.content.split())
+        # Keep word_count in step with edited content (e.g. from the admin);
+        # partial saves that leave out content do not need it
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.word_count = len(self.content.split())
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "word_count"}
         super().save(*args, **kwargs)
 
 
@@ -203,6 +254,9 @@ class AnalysisResult(models.Model):
     # Error handling
     error_message = models.TextField(blank=True, null=True)
     
+    # Full-text search document (PostgreSQL only, see apps.documents.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     # AI Generated PDF Report
     pdf_report = models.FileField(
         upload_to="reports/%Y/%m/%d/",
@@ -234,6 +288,14 @@ class AnalysisResult(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["compliance_status"]),
             models.Index(fields=["created_at"]),
+            # Match the admin's filter + default ordering combinations
+            models.Index(fields=["status", "-created_at"], name="ar_status_created_idx"),
+            models.Index(fields=["compliance_status", "-created_at"], name="ar_compliance_created_idx"),
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(status="completed"),
+                name="ar_completed_created_idx",
+            ),
         ]
     
     def __str__(self):
@@ -0,0 +1,49 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+class ChunkPagination(PageNumberPagination):
+    """Page-number pagination for a document's chunk listing."""
+    
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin paginator that uses PostgreSQL's planner estimate for unfiltered counts.
+    
+    An exact ``COUNT(*)`` is a full scan on PostgreSQL. For unfiltered change-lists
+    on large tables the ``pg_class.reltuples`` estimate is used instead; filtered
+    querysets, small tables and other databases fall back to the exact count.
+    """
+    
+    # Below this many (estimated) rows an exact count is cheap enough
+    estimate_threshold = 10000
+    
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+    
+    def _estimated_count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is None or query.where:
+            return None
+        
+        connection = connections[self.object_list.db]
+        if connection.vendor != "postgresql":
+            return None
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [self.object_list.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
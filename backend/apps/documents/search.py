@@ -0,0 +1,44 @@
+"""
+PostgreSQL full-text search helpers for documents and analysis results.
+
+The ``search_vector`` columns are only maintained on PostgreSQL; on other
+backends (SQLite in development) these helpers are no-ops and callers fall
+back to plain ``icontains`` lookups.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+
+SEARCH_CONFIG = "english"
+
+
+def full_text_search_enabled() -> bool:
+    """Return True if the default database supports the stored tsvectors."""
+    return connection.vendor == "postgresql"
+
+
+def chunk_search_vector():
+    """Search vector expression for DocumentChunk rows (headings rank higher)."""
+    return (
+        SearchVector("heading", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("content", config=SEARCH_CONFIG)
+    )
+
+
+def analysis_search_vector():
+    """Search vector expression for AnalysisResult rows."""
+    return (
+        SearchVector("checklist_title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("summary", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset, expression) -> None:
+    """Recompute ``search_vector`` for every row in ``queryset``."""
+    if full_text_search_enabled():
+        queryset.update(search_vector=expression)
+
+
+def search_query(term: str) -> SearchQuery:
+    """Build a web-style search query for a user-supplied term."""
+    return SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
@@ -1,54 +1,116 @@
+import re
+from collections.abc import Mapping
+from operator import attrgetter, itemgetter
+
+from django.db import models
+from django.utils.functional import cached_property
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from .models import Document, DocumentChunk
+from .storage import stored_file_url
+from .utils.analyzer import ISO27001_CHECKLISTS
+from .utils.extraction import has_file_signature
 
+# Maximum accepted upload size (50MB)
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
 
-class DocumentChunkSerializer(serializers.ModelSerializer):
-    """Serializer for document chunks."""
+# Maximum number of files accepted in a single analysis request
+MAX_ANALYZE_FILES = 100
+
+# Maximum number of checklists analyzed by a single analyze-many request
+MAX_ANALYZE_CHECKLISTS = len(ISO27001_CHECKLISTS)
+
+# Characters rejected by CharField's built-in validators (null and surrogates)
+_PROHIBITED_CHARS_RE = re.compile(r"[\x00\ud800-\udfff]")
+
+
+# The read-only serializers below use plain Serializer classes with explicit
+# fields, skipping ModelSerializer's per-instance model field introspection.
+
+
+class FlatListSerializer(serializers.ListSerializer):
+    """
+    List serializer for read-only children whose fields read plain attributes.
     
-    class Meta:
-        model = DocumentChunk
+    The child's readable fields are resolved once per list rather than once
+    per row, and each value is read directly from the instance (or from the
+    dict, for ``.values()`` querysets) instead of through DRF's generic source
+    traversal. A child may define ``finish_representation(instance, data)``
+    to adjust each row afterwards.
+    """
+    
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        instances = list(iterable)
+        if not instances:
+            return []
+        getter = itemgetter if isinstance(instances[0], Mapping) else attrgetter
         fields = [
-            "id",
-            "chunk_index",
-            "content",
-            "heading",
-            "char_count",
-            "word_count",
-            "start_char",
-            "end_char",
-            "created_at",
+            (field.field_name, getter(field.source), field.to_representation)
+            for field in self.child._readable_fields
         ]
-        read_only_fields = fields
+        finish = getattr(self.child, "finish_representation", None)
+        
+        rows = []
+        for instance in instances:
+            row = {}
+            for name, get_value, to_representation in fields:
+                value = get_value(instance)
+                row[name] = None if value is None else to_representation(value)
+            rows.append(finish(instance, row) if finish else row)
+        return rows
+
+
+class DocumentChunkSerializer(serializers.Serializer):
+    """Serializer for document chunks."""
+    
+    id = serializers.UUIDField(read_only=True)
+    chunk_index = serializers.IntegerField(read_only=True)
+    content = serializers.CharField(read_only=True)
+    heading = serializers.CharField(read_only=True)
+    char_count = serializers.IntegerField(read_only=True)
+    word_count = serializers.IntegerField(read_only=True)
+    start_char = serializers.IntegerField(read_only=True)
+    end_char = serializers.IntegerField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
 
 
-class DocumentChunkListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for listing chunks (without full content)."""
+class DocumentChunkListSerializer(serializers.Serializer):
+    """
+    Lightweight serializer for listing chunks (without full content).
     
-    preview = serializers.SerializerMethodField()
+    Expects a queryset built with ``DocumentChunk.objects.with_preview()``.
+    """
+    
+    id = serializers.UUIDField(read_only=True)
+    chunk_index = serializers.IntegerField(read_only=True)
+    heading = serializers.CharField(read_only=True)
+    char_count = serializers.IntegerField(read_only=True)
+    word_count = serializers.IntegerField(read_only=True)
+    preview = serializers.CharField(read_only=True)
     
     class Meta:
-        model = DocumentChunk
-        fields = [
-            "id",
-            "chunk_index",
-            "heading",
-            "char_count",
-            "word_count",
-            "preview",
-        ]
-        read_only_fields = fields
+        list_serializer_class = FlatListSerializer
     
-    def get_preview(self, obj):
-        """Return first 100 characters of content."""
-        if len(obj.content) > 100:
-            return obj.content[:100] + "..."
-        return obj.content
+    def to_representation(self, instance):
+        return self.finish_representation(instance, super().to_representation(instance))
+    
+    def finish_representation(self, instance, data):
+        if instance.preview_truncated:
+            data["preview"] += "..."
+        return data
 
 
 class DocumentSerializer(serializers.ModelSerializer):
-    """Serializer for document details."""
+    """
+    Serializer for document details.
+    
+    Chunks are only embedded when requested with ``?expand=chunks``; otherwise
+    ``chunks_url`` points to the paginated chunk listing.
+    """
     
-    chunks = DocumentChunkListSerializer(many=True, read_only=True)
+    chunks_url = serializers.SerializerMethodField()
+    chunks = serializers.SerializerMethodField()
     uploaded_by_email = serializers.EmailField(
         source="uploaded_by.email",
         read_only=True,
@@ -69,27 +131,61 @@ class DocumentSerializer(serializers.ModelSerializer):
             "uploaded_at",
             "processed_at",
             "uploaded_by_email",
+            "chunks_url",
             "chunks",
         ]
         read_only_fields = fields
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self._expand_chunks():
+            self.fields.pop("chunks")
+    
+    def _expand_chunks(self):
+        request = self.context.get("request")
+        if request is None:
+            return False
+        expand = request.query_params.get("expand", "")
+        return "chunks" in expand.split(",")
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the related rows this serializer reads."""
+        return queryset.select_related("uploaded_by")
+    
+    def get_chunks_url(self, obj):
+        """Return the URL of the paginated chunk listing for this document."""
+        return reverse(
+            "document-chunks",
+            args=[obj.id],
+            request=self.context.get("request")
+        )
+    
+    def get_chunks(self, obj):
+        """Return chunk previews for the document (only with ``?expand=chunks``)."""
+        chunks = DocumentChunk.objects.filter(document=obj).with_preview()
+        return DocumentChunkListSerializer(chunks, many=True).data
 
 
-class DocumentListSerializer(serializers.ModelSerializer):
+class DocumentListSerializer(serializers.Serializer):
     """Lightweight serializer for listing documents."""
     
+    id = serializers.UUIDField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    file_type = serializers.CharField(read_only=True)
+    file_size = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    total_chunks = serializers.IntegerField(read_only=True)
+    uploaded_at = serializers.DateTimeField(read_only=True)
+    processed_at = serializers.DateTimeField(read_only=True)
+    
     class Meta:
-        model = Document
-        fields = [
-            "id",
-            "name",
-            "file_type",
-            "file_size",
-            "status",
-            "total_chunks",
-            "uploaded_at",
-            "processed_at",
-        ]
-        read_only_fields = fields
+        list_serializer_class = FlatListSerializer
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Fetch only the serialized columns, as dicts rather than model instances."""
+        return queryset.values(*cls._declared_fields)
 
 
 class DocumentUploadSerializer(serializers.Serializer):
@@ -101,18 +197,20 @@ class DocumentUploadSerializer(serializers.Serializer):
     
     def validate_file(self, value):
         """Validate the uploaded file."""
-        from .utils.extraction import get_file_type
-        
         # Check file type - only PDF allowed
-        file_type = get_file_type(value.name)
-        if file_type != "pdf":
+        if not value.name.lower().endswith(".pdf"):
             raise serializers.ValidationError(
                 "Unsupported file type. Only PDF files are allowed."
             )
         
+        # Check the content really is a PDF, not just the file name
+        if not has_file_signature(value, "pdf"):
+            raise serializers.ValidationError(
+                "File content is not a valid PDF document."
+            )
+        
         # Check file size (max 50MB)
-        max_size = 50 * 1024 * 1024
-        if value.size > max_size:
+        if value.size > MAX_UPLOAD_BYTES:
             raise serializers.ValidationError(
                 f"File too large. Maximum size is 50MB."
             )
@@ -137,6 +235,27 @@ class DocumentReprocessSerializer(serializers.Serializer):
     )
 
 
+class StringListField(serializers.ListField):
+    """
+    ListField of non-blank strings validated in a single pass.
+    
+    Well-formed input is trimmed with one comprehension instead of running
+    the child field's validation per item; anything else falls back to the
+    per-item validation so error messages stay the same.
+    """
+    
+    def __init__(self, **kwargs):
+        kwargs["child"] = serializers.CharField()
+        super().__init__(**kwargs)
+    
+    def run_child_validation(self, data):
+        if all(type(item) is str for item in data):
+            result = [item.strip() for item in data]
+            if all(result) and not any(_PROHIBITED_CHARS_RE.search(item) for item in result):
+                return result
+        return super().run_child_validation(data)
+
+
 class AnalyzeRequestSerializer(serializers.Serializer):
     """Serializer for analysis request."""
     
@@ -147,8 +266,8 @@ class AnalyzeRequestSerializer(serializers.Serializer):
         max_length=500,
         help_text="Title of the checklist item"
     )
-    files = serializers.ListField(
-        child=serializers.CharField(),
+    files = StringListField(
+        max_length=MAX_ANALYZE_FILES,
         help_text="List of uploaded file names"
     )
     checklist_prompt = serializers.CharField(
@@ -157,8 +276,7 @@ class AnalyzeRequestSerializer(serializers.Serializer):
         default="",
         help_text="Optional custom AI prompt with detailed requirements"
     )
-    key_controls = serializers.ListField(
-        child=serializers.CharField(),
+    key_controls = StringListField(
         required=False,
         default=list,
         help_text="Optional list of key controls to evaluate"
@@ -166,14 +284,50 @@ class AnalyzeRequestSerializer(serializers.Serializer):
     
     def validate_checklist_id(self, value):
         """Validate that the checklist ID is valid."""
-        if value < 1 or value > 10:  # Support 10 checklists
+        if value not in ISO27001_CHECKLISTS:
             raise serializers.ValidationError(
                 "Invalid checklist ID. Must be between 1 and 10."
             )
         return value
 
 
-class AnalysisResultSerializer(serializers.ModelSerializer):
+class AnalyzeManyRequestSerializer(serializers.Serializer):
+    """Serializer for a request analyzing several checklists at once."""
+    
+    analyses = serializers.ListField(
+        child=AnalyzeRequestSerializer(),
+        min_length=1,
+        max_length=MAX_ANALYZE_CHECKLISTS,
+        help_text="One analysis request per checklist item"
+    )
+
+
+class PdfReportUrlMixin:
+    """
+    Provides ``get_pdf_report_url`` for analysis result serializers.
+    
+    The request's absolute base URL is resolved once per serializer instance
+    rather than once per row.
+    """
+    
+    @cached_property
+    def _absolute_base_url(self):
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri("/")[:-1]
+        return ""
+    
+    def get_pdf_report_url(self, obj):
+        """Return URL for the stored PDF report if available."""
+        if not obj.pdf_report:
+            return None
+        url = stored_file_url(obj.pdf_report)
+        if url.startswith("/"):
+            return self._absolute_base_url + url
+        return url
+
+
+class AnalysisResultSerializer(PdfReportUrlMixin, serializers.ModelSerializer):
     """Serializer for analysis results."""
     
     documents = DocumentListSerializer(many=True, read_only=True)
@@ -203,49 +357,28 @@ class AnalysisResultSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
     
-    def get_pdf_report_url(self, obj):
-        """Return URL for the stored PDF report if available."""
-        if obj.pdf_report:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.pdf_report.url)
-            return obj.pdf_report.url
-        return None
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the related rows this serializer reads."""
+        return queryset.prefetch_related("documents")
 
 
-class AnalysisResultListSerializer(serializers.ModelSerializer):
+class AnalysisResultListSerializer(PdfReportUrlMixin, serializers.Serializer):
     """Lightweight serializer for listing analysis results."""
     
+    id = serializers.UUIDField(read_only=True)
+    checklist_id = serializers.IntegerField(read_only=True)
+    checklist_title = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    compliance_status = serializers.CharField(read_only=True)
+    compliance_score = serializers.FloatField(read_only=True)
+    summary = serializers.CharField(read_only=True)
+    findings = serializers.JSONField(read_only=True)
+    recommendations = serializers.JSONField(read_only=True)
+    gaps = serializers.JSONField(read_only=True)
+    comments = serializers.JSONField(read_only=True)
+    control_scores = serializers.JSONField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    completed_at = serializers.DateTimeField(read_only=True)
     pdf_report_url = serializers.SerializerMethodField()
-    
-    class Meta:
-        from .models import AnalysisResult
-        model = AnalysisResult
-        fields = [
-            "id",
-            "checklist_id",
-            "checklist_title",
-            "status",
-            "compliance_status",
-            "compliance_score",
-            "summary",
-            "findings",
-            "recommendations",
-            "gaps",
-            "comments",
-            "control_scores",
-            "created_at",
-            "completed_at",
-            "pdf_report_url",
-        ]
-        read_only_fields = fields
-    
-    def get_pdf_report_url(self, obj):
-        """Return URL for the stored PDF report if available."""
-        if obj.pdf_report:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.pdf_report.url)
-            return obj.pdf_report.url
-        return None
         
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Helpers for building URLs to stored files.
+"""
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+
+
+def stored_file_url(field_file) -> str:
+    """
+    Return the public URL of a stored file.
+    
+    Filesystem storage URLs are a plain ``base_url`` prefix, so they are built
+    directly instead of going through ``Storage.url()``. Other backends (which may
+    sign or otherwise compute URLs) keep using ``field_file.url``.
+    """
+    storage = field_file.storage
+    if isinstance(storage, FileSystemStorage):
+        return storage.base_url + filepath_to_uri(field_file.name).lstrip("/")
+    return field_file.url
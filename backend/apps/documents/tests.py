@@ -1,6 +1,22 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
-from .models import Document, DocumentChunk
-from .utils import SemanticChunker, extract_text
+from rest_framework.test import APIClient
+from apps.users.models import User
+from .models import AnalysisResult, Document, DocumentChunk
+from .serializers import (
+    AnalyzeManyRequestSerializer,
+    AnalyzeRequestSerializer,
+    DocumentChunkListSerializer,
+    DocumentUploadSerializer,
+    MAX_ANALYZE_CHECKLISTS,
+    MAX_ANALYZE_FILES,
+)
+from .utils import Chunk, DocumentAnalyzer, ISO27001_CHECKLISTS, SemanticChunker, extract_text
+from .utils.analyzer import _keyword_excerpts, _read_json_stream
 
 
 class SemanticChunkerTest(TestCase):
@@ -89,15 +105,33 @@ class DocumentModelTest(TestCase):
             file_size=100
         )
         
+        chunk_data = Chunk(
+            content="This is a test chunk.",
+            start_char=0,
+            end_char=21
+        )
         chunk = DocumentChunk.objects.create(
             document=doc,
-            content="This is a test chunk.",
-            chunk_index=0
+            content=chunk_data.content,
+            chunk_index=0,
+            word_count=chunk_data.word_count
         )
+        chunk.refresh_from_db()
         
         self.assertEqual(chunk.document, doc)
         self.assertEqual(chunk.char_count, len("This is a test chunk."))
-        self.assertGreater(chunk.word_count, 0)
+        self.assertEqual(chunk.word_count, 5)
+    
+    def test_chunk_edit_updates_word_count(self):
+        """Test that saving edited content recomputes the word count."""
+        doc = Document.objects.create(name="test.txt", file_type="txt", file_size=100)
+        chunk = DocumentChunk.objects.create(document=doc, content="Two words", chunk_index=0)
+        
+        chunk.content = "Now there are\nfive words"
+        chunk.save()
+        chunk.refresh_from_db()
+        
+        self.assertEqual(chunk.word_count, 5)
     
     def test_cascade_delete(self):
         """Test that deleting a document deletes its chunks."""
@@ -125,3 +159,248 @@ class DocumentModelTest(TestCase):
             DocumentChunk.objects.filter(document_id=doc_id).count(),
             0
         )
+
+
+class DocumentChunkPreviewTest(TestCase):
+    """Tests for the database-computed chunk preview."""
+    
+    def setUp(self):
+        self.doc = Document.objects.create(name="test.pdf", file_type="pdf")
+    
+    def test_short_content_not_truncated(self):
+        """Test that short content is returned as-is."""
+        DocumentChunk.objects.create(document=self.doc, content="Short chunk.", chunk_index=0)
+        
+        chunk = DocumentChunk.objects.with_preview().get()
+        data = DocumentChunkListSerializer(chunk).data
+        
+        self.assertEqual(data["preview"], "Short chunk.")
+    
+    def test_long_content_truncated(self):
+        """Test that long content is cut to 100 characters with an ellipsis."""
+        DocumentChunk.objects.create(document=self.doc, content="x" * 250, chunk_index=0)
+        
+        chunk = DocumentChunk.objects.with_preview().get()
+        data = DocumentChunkListSerializer(chunk).data
+        
+        self.assertEqual(data["preview"], "x" * 100 + "...")
+        self.assertIn("content", chunk.get_deferred_fields())
+    
+    def test_list_matches_single(self):
+        """Test that the list fast path renders the same rows as single instances."""
+        DocumentChunk.objects.create(document=self.doc, content="x" * 250, chunk_index=0)
+        DocumentChunk.objects.create(document=self.doc, content="Short chunk.", chunk_index=1, heading="Scope")
+        
+        chunks = list(DocumentChunk.objects.with_preview().order_by("chunk_index"))
+        data = DocumentChunkListSerializer(chunks, many=True).data
+        
+        self.assertEqual(data, [DocumentChunkListSerializer(c).data for c in chunks])
+
+
+class DocumentUploadSerializerTest(TestCase):
+    """Tests for upload validation."""
+    
+    def test_pdf_signature_accepted(self):
+        """Test that a file starting with the PDF signature is accepted."""
+        upload = SimpleUploadedFile("policy.pdf", b"%PDF-1.4 body")
+        serializer = DocumentUploadSerializer(data={"file": upload})
+        
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(upload.tell(), 0)
+    
+    def test_renamed_file_rejected(self):
+        """Test that a non-PDF file with a .pdf name is rejected."""
+        upload = SimpleUploadedFile("policy.pdf", b"PK\x03\x04 not a pdf")
+        serializer = DocumentUploadSerializer(data={"file": upload})
+        
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("file", serializer.errors)
+
+
+class AnalyzeRequestSerializerTest(TestCase):
+    """Tests for analysis request validation."""
+    
+    def test_file_names_trimmed(self):
+        """Test that file names are validated and trimmed."""
+        serializer = AnalyzeRequestSerializer(data={
+            "checklist_id": 1,
+            "checklist_title": "Policies",
+            "files": [" policy.pdf ", "scope.pdf"],
+        })
+        
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["files"], ["policy.pdf", "scope.pdf"])
+    
+    def test_invalid_requests_rejected(self):
+        """Test that blank names, too many files and unknown checklists are rejected."""
+        serializer = AnalyzeRequestSerializer(data={
+            "checklist_id": 99,
+            "checklist_title": "Policies",
+            "files": ["policy.pdf", " "],
+        })
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(set(serializer.errors), {"checklist_id", "files"})
+        
+        serializer = AnalyzeRequestSerializer(data={
+            "checklist_id": 1,
+            "checklist_title": "Policies",
+            "files": ["policy.pdf"] * (MAX_ANALYZE_FILES + 1),
+        })
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("files", serializer.errors)
+    
+    def test_invalid_file_list_returns_400(self):
+        """Test that per-item list errors (keyed by index) render as a 400 response."""
+        user = User.objects.create(name="Auditor", email="auditor@example.com", role="auditor", password="x")
+        client = APIClient()
+        client.force_authenticate(user)
+        
+        response = client.post(
+            "/api/analyze/",
+            {"checklist_id": 1, "checklist_title": "Policies", "files": ["a.pdf", " "]},
+            format="json"
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), {"files": {"1": ["This field may not be blank."]}})
+    
+    def test_analyze_many_capped_at_checklist_count(self):
+        """Test that an analyze-many request accepts at most one entry per checklist."""
+        item = {"checklist_id": 1, "checklist_title": "Policies", "files": ["policy.pdf"]}
+        
+        serializer = AnalyzeManyRequestSerializer(data={"analyses": [item] * MAX_ANALYZE_CHECKLISTS})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        
+        serializer = AnalyzeManyRequestSerializer(data={"analyses": [item] * (MAX_ANALYZE_CHECKLISTS + 1)})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("analyses", serializer.errors)
+    
+    def test_analyze_many_returns_results_in_request_order(self):
+        """Test that analyze-many reports a result or an error for each checklist."""
+        user = User.objects.create(name="Auditor", email="auditor@example.com", role="auditor", password="x")
+        doc = Document.objects.create(name="policy.pdf", file_type="pdf", uploaded_by=user, status="completed")
+        DocumentChunk.objects.create(document=doc, content="The security policy is approved yearly.", chunk_index=0)
+        client = APIClient()
+        client.force_authenticate(user)
+        
+        response = client.post(
+            "/api/analyze-many/",
+            {"analyses": [
+                {"checklist_id": 2, "checklist_title": "Organization", "files": ["missing.pdf"]},
+                {"checklist_id": 1, "checklist_title": "Policies", "files": ["policy.pdf"]},
+            ]},
+            format="json"
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        missing, analyzed = response.json()["results"]
+        self.assertEqual(missing["checklist_id"], 2)
+        self.assertIn("error", missing)
+        self.assertEqual(analyzed["checklist_id"], 1)
+        self.assertEqual(analyzed["status"], "completed")
+    
+    def test_analyze_many_failure_marks_results_failed(self):
+        """Test that an unexpected error does not leave created analyses pending."""
+        user = User.objects.create(name="Auditor", email="auditor@example.com", role="auditor", password="x")
+        doc = Document.objects.create(name="policy.pdf", file_type="pdf", uploaded_by=user, status="completed")
+        DocumentChunk.objects.create(document=doc, content="The security policy is approved yearly.", chunk_index=0)
+        client = APIClient()
+        client.force_authenticate(user)
+        
+        with mock.patch.object(DocumentAnalyzer, "analyze_many", side_effect=RuntimeError("worker died")):
+            response = client.post(
+                "/api/analyze-many/",
+                {"analyses": [{"checklist_id": 1, "checklist_title": "Policies", "files": ["policy.pdf"]}]},
+                format="json"
+            )
+        
+        self.assertEqual(response.status_code, 500)
+        result = AnalysisResult.objects.get()
+        self.assertEqual(result.status, "failed")
+        self.assertEqual(result.error_message, "worker died")
+
+
+class DocumentConditionalGetTest(TestCase):
+    """Tests for ETag handling on the document endpoints."""
+    
+    def setUp(self):
+        self.user = User.objects.create(name="Auditor", email="auditor@example.com", role="auditor", password="x")
+        self.doc = Document.objects.create(name="test.pdf", file_type="pdf", uploaded_by=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def test_not_modified_until_saved(self):
+        """Test that a matching ETag gets 304 until the document changes."""
+        url = f"/api/files/{self.doc.id}/"
+        etag = self.client.get(url, HTTP_HOST="localhost")["ETag"]
+        
+        response = self.client.get(url, HTTP_HOST="localhost", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        
+        self.doc.status = Document.Status.COMPLETED
+        self.doc.save()
+        
+        response = self.client.get(url, HTTP_HOST="localhost", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class DocumentAnalyzerPrefilterTest(TestCase):
+    """Tests for the keyword prefilter in front of Azure OpenAI."""
+    
+    def test_unrelated_document_skips_ai(self):
+        """Test that a document without checklist topics is not sent to the AI."""
+        analyzer = DocumentAnalyzer()
+        analyzer.use_azure = True
+        analyzer.client = mock.Mock()
+        result = AnalysisResult.objects.create(checklist_id=1, checklist_title="Policies")
+        
+        success = analyzer.analyze(result, [{"content": "Quarterly cafeteria menu and parking rota."}])
+        
+        self.assertTrue(success)
+        analyzer.client.chat.completions.create.assert_not_called()
+        result.refresh_from_db()
+        self.assertEqual(result.compliance_status, "not_applicable")
+    
+    def test_repeated_analysis_uses_cached_result(self):
+        """Test that the same checklist and document are only sent to the AI once."""
+        cache.clear()
+        analyzer = DocumentAnalyzer()
+        analyzer.use_azure = True
+        reply = {"compliance_status": "compliant", "compliance_score": 0.9}
+        chunks = [{"content": "The security policy and strategy are approved yearly."}]
+        
+        with mock.patch.object(analyzer, "_request_json", return_value=reply) as request_json:
+            for _ in range(2):
+                result = AnalysisResult.objects.create(checklist_id=1, checklist_title="Policies")
+                self.assertTrue(analyzer.analyze(result, chunks))
+        
+        request_json.assert_called_once()
+        result.refresh_from_db()
+        self.assertEqual(result.compliance_status, "compliant")
+    
+    def test_long_document_excerpted_around_keywords(self):
+        """Test that prompt content keeps keyword passages beyond the size limit."""
+        content = "filler " * 5000 + "The information security policy is approved. " + "x" * 50000
+        
+        excerpt = _keyword_excerpts(content, ISO27001_CHECKLISTS[1], 2000)
+        
+        self.assertEqual(len(excerpt), 2000)
+        self.assertIn("information security policy is approved", excerpt)
+
+
+class DocumentAnalyzerStreamTest(TestCase):
+    """Tests for reading streamed Azure OpenAI responses."""
+    
+    def test_stream_stops_at_end_of_json_object(self):
+        """Test that the stream is closed once the top-level object is complete."""
+        deltas = ['{"summary": "uses {braces} and \\"quotes\\"", ', '"gaps": []}', " trailing", " text"]
+        chunks = [mock.Mock(choices=[mock.Mock(delta=mock.Mock(content=text))]) for text in deltas]
+        stream = mock.MagicMock()
+        stream.__iter__.return_value = iter(chunks)
+        
+        raw_output = _read_json_stream(stream)
+        
+        self.assertEqual(json.loads(raw_output)["gaps"], [])
+        self.assertEqual(raw_output, "".join(deltas[:2]))
+        stream.close.assert_called_once()
@@ -1,14 +1,16 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from .views import DocumentViewSet, DocumentChunkViewSet, AnalyzeView, AnalysisResultViewSet, ExportAuditReportView
+from rest_framework.routers import SimpleRouter
+from .views import DocumentViewSet, DocumentChunkViewSet, AnalyzeView, AnalyzeManyView, AnalysisResultViewSet, ExportAuditReportView
 
-router = DefaultRouter()
+# SimpleRouter: no browsable API root view or format-suffix variants of every route
+router = SimpleRouter()
 router.register(r"files", DocumentViewSet, basename="document")
 router.register(r"chunks", DocumentChunkViewSet, basename="chunk")
 router.register(r"analyses", AnalysisResultViewSet, basename="analysis")
 
 urlpatterns = [
     path("analyze/", AnalyzeView.as_view(), name="analyze"),
+    path("analyze-many/", AnalyzeManyView.as_view(), name="analyze-many"),
     path("export-report/", ExportAuditReportView.as_view(), name="export-report"),
     path("", include(router.urls)),
 ]
@@ -1,17 +1,33 @@
-from .extraction import extract_text, get_file_type, TextExtractionError
-from .chunking import SemanticChunker, semantic_chunk, Chunk
-from .processor import DocumentProcessor, process_document
-from .analyzer import DocumentAnalyzer, ISO27001_CHECKLISTS
+import importlib
 
-__all__ = [
-    "extract_text",
-    "get_file_type",
-    "TextExtractionError",
-    "SemanticChunker",
-    "semantic_chunk",
-    "Chunk",
-    "DocumentProcessor",
-    "process_document",
-    "DocumentAnalyzer",
-    "ISO27001_CHECKLISTS",
-]
+# Public names and the submodule that defines them. They are imported on first
+# access (PEP 562), so importing one submodule does not load the others: the
+# serializers' imports of ``utils.extraction`` and ``utils.analyzer`` leave the
+# processor and chunker unloaded.
+_EXPORTS = {
+    "extract_text": "extraction",
+    "get_file_type": "extraction",
+    "TextExtractionError": "extraction",
+    "SemanticChunker": "chunking",
+    "semantic_chunk": "chunking",
+    "Chunk": "chunking",
+    "DocumentProcessor": "processor",
+    "process_document": "processor",
+    "DocumentAnalyzer": "analyzer",
+    "ISO27001_CHECKLISTS": "analyzer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,16 +2,73 @@
 AI-powered document analyzer for ISO 27001 compliance checking.
 """
 
+import hashlib
 import logging
 import json
 import os
 import re
-from typing import List, Dict, Any, Optional
-from django.conf import settings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Sequence, Tuple
+from django.core.cache import cache
+from django.db import connections
 from django.utils import timezone
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# JSON parser for LLM responses: orjson when installed (its decode errors
+# subclass json.JSONDecodeError), otherwise the standard library
+_json_loads = orjson.loads if orjson else json.loads
+
+# Maximum number of checklist analyses run at the same time by analyze_many()
+ANALYZE_MAX_CONCURRENCY = int(os.getenv("ANALYZE_MAX_CONCURRENCY", "4"))
+
+# Retries for rate-limited (429) and failed (5xx) Azure OpenAI requests; the
+# SDK backs off exponentially between attempts and honours Retry-After
+AZURE_MAX_RETRIES = int(os.getenv("AZURE_OPENAI_MAX_RETRIES", "3"))
+
+# Lifetime of cached Azure OpenAI results for identical prompts (seconds)
+ANALYSIS_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Characters of document content sent to Azure OpenAI, and the context kept
+# on each side of a keyword hit when a longer document has to be excerpted
+MAX_PROMPT_CONTENT_CHARS = 18000
+EXCERPT_RADIUS = 512
+
+# AnalysisResult columns written when an analysis completes
+RESULT_UPDATE_FIELDS = [
+    "compliance_status",
+    "compliance_score",
+    "summary",
+    "findings",
+    "recommendations",
+    "gaps",
+    "comments",
+    "control_scores",
+    "status",
+    "completed_at",
+]
+
+# Opening of the system prompt sent with every Azure OpenAI analysis
+AUDITOR_SYSTEM_PROMPT = (
+    "You are an expert ISO 27001 compliance auditor with deep knowledge of information "
+    "security management systems. Always respond with valid JSON only. Provide detailed, "
+    "specific, and actionable analysis."
+)
+
+# Compliance statuses accepted from the model (AnalysisResult.ComplianceStatus)
+VALID_COMPLIANCE_STATUSES = frozenset(("compliant", "partial", "non_compliant", "not_applicable"))
+
+# Minimum share of a checklist's keywords a document must mention before it is
+# sent to Azure OpenAI; below this the checklist is marked not applicable.
+PREFILTER_THRESHOLD = float(os.getenv("ISO_PREFILTER_THRESHOLD", "0.1"))
+
 # ISO 27001:2022 Checklist definitions with comprehensive requirements
 ISO27001_CHECKLISTS = {
     1: {
@@ -793,6 +850,301 @@ AUDIT CHECKLIST:
     },
 }
 
+# Freeze the definitions: they are shared by concurrent analyses (see
+# analyze_many), so expose read-only mappings with tuple keyword/control lists
+ISO27001_CHECKLISTS = MappingProxyType({
+    checklist_id: MappingProxyType({
+        **info,
+        "controls": tuple(info["controls"]),
+        "keywords": tuple(info["keywords"]),
+    })
+    for checklist_id, info in ISO27001_CHECKLISTS.items()
+})
+
+
+class _ChecklistIndex(NamedTuple):
+    """Lowercased search data for one checklist, derived once from its definition."""
+    keywords_lower: tuple  # one entry per keyword
+    audit_items: tuple  # (item text, key terms) per "□" requirement line
+    control_words: tuple  # lowercased words of each control
+    terms: frozenset  # every distinct term above
+
+
+def _index_checklist(checklist_info: Dict) -> _ChecklistIndex:
+    """Build the search data ``_analyze_mock`` needs for a checklist."""
+    keywords_lower = tuple(kw.lower() for kw in checklist_info.get("keywords", ()))
+    
+    # Extract audit checklist items from requirements, with their key terms
+    audit_items = []
+    for line in checklist_info.get("requirements", "").split('\n'):
+        if line.strip().startswith('□'):
+            item = line.strip()[1:].strip()
+            key_terms = tuple([word.lower() for word in item.split() if len(word) > 4][:3])
+            audit_items.append((item, key_terms))
+    
+    control_words = tuple(
+        tuple(control.lower().split()) for control in checklist_info.get("controls", ())
+    )
+    
+    terms = set(keywords_lower)
+    for _item, key_terms in audit_items:
+        terms.update(key_terms)
+    for words in control_words:
+        terms.update(words[:4])
+    
+    return _ChecklistIndex(keywords_lower, tuple(audit_items), control_words, frozenset(terms))
+
+
+# Search data per checklist, computed once at import
+_CHECKLIST_INDEX = {
+    checklist_id: _index_checklist(info)
+    for checklist_id, info in ISO27001_CHECKLISTS.items()
+}
+
+
+def _checklist_index(checklist_info: Dict) -> _ChecklistIndex:
+    """Return the precomputed search data for a checklist (built on the fly if unknown)."""
+    index = _CHECKLIST_INDEX.get(checklist_info.get("id"))
+    if index is None:
+        index = _index_checklist(checklist_info)
+    return index
+
+
+def _keyword_coverage(content_lower: str, checklist_info: Dict) -> float:
+    """Return the share of the checklist's keywords found in the content (1.0 if it has none)."""
+    keywords_lower = _checklist_index(checklist_info).keywords_lower
+    if not keywords_lower:
+        return 1.0
+    return sum(1 for kw in keywords_lower if kw in content_lower) / len(keywords_lower)
+
+
+def _merge_windows(positions: List[int], radius: int, length: int) -> List[List[int]]:
+    """Merge ``radius``-wide windows around sorted positions into disjoint [start, end) ranges."""
+    windows = []
+    for pos in sorted(positions):
+        start, end = max(0, pos - radius), min(length, pos + radius)
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return windows
+
+
+def _keyword_excerpts(
+    content: str,
+    checklist_info: Dict,
+    max_chars: int,
+    content_lower: Optional[str] = None
+) -> str:
+    """
+    Shorten ``content`` to ``max_chars`` around the checklist's keywords.
+    
+    Keyword occurrences are collected in rounds (every keyword's next hit per
+    round) until windows of ``EXCERPT_RADIUS`` characters around them cover
+    the budget. If the hits run out first, the windows are widened so the
+    budget is still used. Windows are merged and joined with ``...``
+    markers. Content without any keyword hit is cut to its first
+    ``max_chars`` characters. ``content_lower`` may be passed when the
+    caller already has the lowercased content.
+    """
+    if len(content) <= max_chars:
+        return content
+    
+    if content_lower is None:
+        content_lower = content.lower()
+    next_start = dict.fromkeys(_checklist_index(checklist_info).keywords_lower, 0)
+    hits = []
+    windows = []
+    while next_start:
+        for keyword in list(next_start):
+            pos = content_lower.find(keyword, next_start[keyword])
+            if pos == -1:
+                del next_start[keyword]
+                continue
+            hits.append(pos)
+            # Later hits inside this window would add no new context
+            next_start[keyword] = pos + EXCERPT_RADIUS
+        windows = _merge_windows(hits, EXCERPT_RADIUS, len(content))
+        if sum(end - start for start, end in windows) >= max_chars:
+            break
+    else:
+        if not hits:
+            return content[:max_chars]
+        radius = max_chars // (2 * len(windows))
+        if radius > EXCERPT_RADIUS:
+            windows = _merge_windows(hits, radius, len(content))
+    
+    return "\n...\n".join(content[start:end] for start, end in windows)[:max_chars]
+
+
+def _read_json_stream(stream) -> str:
+    """
+    Collect a streamed chat completion up to the end of its JSON object.
+    
+    Braces are counted outside string literals as the deltas arrive; once the
+    top-level object closes, the stream is closed instead of waiting for any
+    trailing tokens. If it never closes, the full text is returned.
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if not text:
+                continue
+            for i, char in enumerate(text):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char == "{":
+                    depth += 1
+                elif char == "}" and depth:
+                    depth -= 1
+                    if not depth:
+                        parts.append(text[:i + 1])
+                        return "".join(parts)
+            parts.append(text)
+        return "".join(parts)
+    finally:
+        stream.close()
+
+
+# Response shape requested from Azure OpenAI for one checklist item
+RESULT_JSON_SHAPE = """{
+    "compliance_status": "compliant" | "partial" | "non_compliant" | "not_applicable",
+    "compliance_score": 0.0 to 1.0 (where 1.0 is fully compliant, based on percentage of checklist items satisfied),
+    "summary": "Executive summary of the compliance assessment (2-3 sentences summarizing overall compliance posture)",
+    "findings": [
+        "Specific finding 1 with direct reference to document content that addresses a requirement",
+        "Specific finding 2 indicating what requirement is met and how"
+    ],
+    "recommendations": [
+        "Actionable recommendation 1 to improve compliance",
+        "Actionable recommendation 2 to address specific gaps"
+    ],
+    "gaps": [
+        "Specific requirement from the audit checklist that is NOT addressed in the document",
+        "Another missing requirement with explanation of what should be documented"
+    ],
+    "comments": [
+        "General observation about the audit report quality and completeness",
+        "Comment on documentation thoroughness for this control area",
+        "Suggestions for improving the audit evidence"
+    ],
+    "control_scores": {
+        "control_name": 0.0 to 1.0,
+        "another_control": 0.0 to 1.0
+    }
+}"""
+
+ANALYSIS_GUIDELINES = """IMPORTANT GUIDELINES:
+1. Reference the actual document content in your findings
+2. Map gaps directly to the audit checklist items that are not satisfied
+3. Provide practical, actionable recommendations
+4. Score each control individually based on evidence in the document
+5. Be strict in your assessment - only mark items as compliant if there is clear evidence
+6. Consider ISO 27001:2022 specific requirements including new controls"""
+
+
+def _checklist_requirements(checklist_id: Optional[int]) -> str:
+    """Return the controls and audit requirements block for a checklist."""
+    checklist_info = ISO27001_CHECKLISTS.get(checklist_id, {})
+    controls_text = "\n".join([f"- {c}" for c in checklist_info.get("controls", ())])
+    
+    # Get the comprehensive requirements for this checklist
+    requirements = checklist_info.get("requirements", "")
+    
+    return f"""=== SPECIFIC CONTROLS TO EVALUATE ===
+{controls_text}
+
+=== ISO 27001:2022 REQUIREMENTS AND AUDIT CHECKLIST ===
+{requirements}"""
+
+
+@lru_cache(maxsize=64)
+def _audit_instructions(checklist_id: Optional[int], checklist_title: str) -> str:
+    """
+    Return the system prompt for a checklist item.
+    
+    It holds everything except the document itself (controls, requirements,
+    instructions and the JSON shape), so it is identical for every document
+    analyzed against the same item. Azure OpenAI caches such a long shared
+    prefix and only bills the document at the full input rate.
+    """
+    return f"""{AUDITOR_SYSTEM_PROMPT}
+
+Analyze the audit report/document content given in the user message against the ISO 27001 checklist item: "{checklist_title}".
+
+{_checklist_requirements(checklist_id)}
+
+=== ANALYSIS INSTRUCTIONS ===
+Perform a thorough compliance analysis against ALL requirements listed above. For each audit checklist item, determine if the document provides evidence of compliance.
+
+Return ONLY valid JSON with exactly this shape:
+{RESULT_JSON_SHAPE}
+
+{ANALYSIS_GUIDELINES}"""
+
+
+def _parse_json_output(raw_output: str) -> Dict:
+    """Parse the model's JSON reply, tolerating extra text around the object."""
+    try:
+        return _json_loads(raw_output)
+    except json.JSONDecodeError:
+        # Try to extract JSON from the response if it contains extra text
+        json_match = re.search(r'\{[\s\S]*\}', raw_output)
+        if json_match:
+            return _json_loads(json_match.group())
+        raise ValueError(f"LLM returned invalid JSON:\n{raw_output[:500]}")
+
+
+@lru_cache(maxsize=None)
+def _azure_settings() -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Return the Azure OpenAI key, endpoint and deployment from the environment.
+    
+    The ``.env`` file is searched for and parsed on the first call only;
+    later analyzers reuse the same values.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+    return (
+        os.getenv("AZURE_OPENAI_KEY"),
+        os.getenv("AZURE_OPENAI_ENDPOINT"),
+        os.getenv("AZURE_DEPLOYMENT"),
+    )
+
+
+@lru_cache(maxsize=4)
+def _azure_client(api_key: str, endpoint: str):
+    """
+    Return the shared Azure OpenAI client for these credentials.
+    
+    The client is thread-safe and owns an HTTP connection pool, so reusing
+    it across analyzers keeps connections (and TLS sessions) alive between
+    requests instead of setting them up for every analysis.
+    """
+    from openai import AzureOpenAI
+    return AzureOpenAI(
+        api_key=api_key,
+        azure_endpoint=endpoint,
+        api_version="2024-12-01-preview",
+        max_retries=AZURE_MAX_RETRIES,
+    )
+
+
+# Ten-segment score bars for the debug log, indexed by int(score * 10)
+_SCORE_BARS = tuple('█' * filled + '░' * (10 - filled) for filled in range(11))
+
 
 class DocumentAnalyzer:
     """
@@ -800,22 +1152,12 @@ class DocumentAnalyzer:
     """
     
     def __init__(self):
-        from dotenv import load_dotenv
-        load_dotenv()
-        
-        self.azure_api_key = os.getenv("AZURE_OPENAI_KEY")
-        self.azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        self.azure_deployment = os.getenv("AZURE_DEPLOYMENT")
+        self.azure_api_key, self.azure_endpoint, self.azure_deployment = _azure_settings()
         self.use_azure = bool(self.azure_api_key and self.azure_endpoint and self.azure_deployment)
         
         if self.use_azure:
             try:
-                from openai import AzureOpenAI
-                self.client = AzureOpenAI(
-                    api_key=self.azure_api_key,
-                    azure_endpoint=self.azure_endpoint,
-                    api_version="2024-12-01-preview"
-                )
+                self.client = _azure_client(self.azure_api_key, self.azure_endpoint)
                 logger.info("Azure OpenAI client initialized successfully")
             except ImportError:
                 logger.warning("OpenAI package not installed. Using mock analysis.")
@@ -848,14 +1190,15 @@ class DocumentAnalyzer:
     def analyze(
         self,
         analysis_result,
-        document_chunks: List[Dict[str, Any]],
+        document_chunks: Iterable[Dict[str, Any]],
     ) -> bool:
         """
         Analyze document chunks against an ISO 27001 checklist.
         
         Args:
             analysis_result: The AnalysisResult model instance to update
-            document_chunks: List of document chunks with their content
+            document_chunks: Document chunks with their content (any iterable,
+                consumed once, so a streamed queryset works as well as a list)
             
         Returns:
             True if analysis succeeded, False otherwise
@@ -865,254 +1208,261 @@ class DocumentAnalyzer:
         try:
             # Update status to processing
             analysis_result.status = AnalysisResult.Status.PROCESSING
-            analysis_result.save()
+            analysis_result.save(update_fields=["status"])
             
             checklist_id = analysis_result.checklist_id
             checklist_info = ISO27001_CHECKLISTS.get(checklist_id, {})
             
-            print("\n" + "="*80)
-            print("🔍 ISOGUARD ANALYSIS STARTED")
-            print("="*80)
-            print(f"📋 Checklist: {analysis_result.checklist_title}")
-            print(f"📄 Documents: {len(document_chunks)} chunk(s) to analyze")
-            print(f"🤖 Using: {'Azure OpenAI' if self.use_azure else 'Mock Analysis'}")
-            
-            # Combine all chunk content and sanitize
-            combined_content = "\n\n".join([
-                chunk.get("content", "") for chunk in document_chunks
-            ])
+            # Sanitize each chunk (removing invalid Unicode characters) before
+            # joining, so the sanitizer's intermediate copies stay chunk-sized
+            # instead of spanning the whole combined document
+            contents = [
+                self._sanitize_text(chunk.get("content", "")) for chunk in document_chunks
+            ]
+            combined_content = "\n\n".join(contents)
             
-            # Sanitize content to remove invalid Unicode characters
-            combined_content = self._sanitize_text(combined_content)
-            
-            print(f"📝 Total content length: {len(combined_content)} characters")
+            logger.debug(
+                "Analysis started: checklist=%r, %d chunk(s), %d characters, using %s",
+                analysis_result.checklist_title,
+                len(contents),
+                len(combined_content),
+                "Azure OpenAI" if self.use_azure else "mock analysis",
+            )
+            del contents  # only the joined copy is needed from here on
             
             if not combined_content.strip():
-                print("❌ ERROR: No document content to analyze")
+                logger.warning("No document content to analyze for %r", analysis_result.checklist_title)
                 analysis_result.status = AnalysisResult.Status.FAILED
                 analysis_result.error_message = "No document content to analyze"
-                analysis_result.save()
+                analysis_result.save(update_fields=["status", "error_message"])
                 return False
             
+            # Lowercased once and shared by the prefilter, excerpting and mock analysis
+            content_lower = combined_content.lower()
+            
+            # Documents that barely touch this checklist skip the AI call
+            keyword_coverage = (
+                _keyword_coverage(content_lower, checklist_info)
+                if self.use_azure else 1.0
+            )
+            
             # Perform analysis
-            print("\n⏳ Sending to AI for analysis...")
-            if self.use_azure:
+            if self.use_azure and keyword_coverage < PREFILTER_THRESHOLD:
+                logger.debug("AI analysis skipped: only %.0f%% of checklist topics found", keyword_coverage * 100)
+                result = self._prefiltered_result(analysis_result.checklist_title, keyword_coverage)
+            elif self.use_azure:
                 result = self._analyze_with_azure(
                     combined_content,
                     checklist_info,
-                    analysis_result.checklist_title
+                    analysis_result.checklist_title,
+                    content_lower=content_lower
                 )
             else:
                 result = self._analyze_mock(
                     combined_content,
                     checklist_info,
-                    analysis_result.checklist_title
+                    analysis_result.checklist_title,
+                    content_lower=content_lower
                 )
             
-            # Log the results
-            print("\n" + "-"*80)
-            print("📊 ANALYSIS RESULTS")
-            print("-"*80)
-            print(f"✅ Compliance Status: {result.get('compliance_status', 'N/A').upper()}")
-            print(f"📈 Compliance Score: {result.get('compliance_score', 0) * 100:.1f}%")
-            print(f"\n📝 Summary:\n   {result.get('summary', 'No summary available')}")
-            
-            if result.get('findings'):
-                print(f"\n🔎 Findings ({len(result.get('findings', []))})")
-                for i, finding in enumerate(result.get('findings', [])[:5], 1):
-                    print(f"   {i}. {finding}")
-            
-            if result.get('recommendations'):
-                print(f"\n💡 Recommendations ({len(result.get('recommendations', []))})")
-                for i, rec in enumerate(result.get('recommendations', [])[:5], 1):
-                    print(f"   {i}. {rec}")
-            
-            if result.get('gaps'):
-                print(f"\n⚠️  Gaps ({len(result.get('gaps', []))})")
-                for i, gap in enumerate(result.get('gaps', [])[:5], 1):
-                    print(f"   {i}. {gap}")
-            
-            if result.get('comments'):
-                print(f"\n💬 Comments ({len(result.get('comments', []))})")
-                for i, comment in enumerate(result.get('comments', [])[:5], 1):
-                    print(f"   {i}. {comment}")
-            
-            if result.get('control_scores'):
-                print(f"\n📋 Control Scores:")
-                for control, score in result.get('control_scores', {}).items():
-                    bar = '█' * int(score * 10) + '░' * (10 - int(score * 10))
-                    print(f"   {control}: [{bar}] {score * 100:.0f}%")
-            
-            print("\n" + "="*80)
-            print("✅ ANALYSIS COMPLETE")
-            print("="*80 + "\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_result(analysis_result.checklist_title, result)
             
             # Update the analysis result
-            analysis_result.compliance_status = result.get("compliance_status")
-            analysis_result.compliance_score = result.get("compliance_score", 0.0)
-            analysis_result.summary = result.get("summary", "")
-            analysis_result.findings = result.get("findings", [])
-            analysis_result.recommendations = result.get("recommendations", [])
-            analysis_result.gaps = result.get("gaps", [])
-            analysis_result.comments = result.get("comments", [])
-            analysis_result.control_scores = result.get("control_scores", {})
-            analysis_result.status = AnalysisResult.Status.COMPLETED
-            analysis_result.completed_at = timezone.now()
-            analysis_result.save()
+            self._apply_result(analysis_result, result)
+            analysis_result.save(update_fields=RESULT_UPDATE_FIELDS)
+            
+            from ..search import analysis_search_vector, update_search_vectors
+            update_search_vectors(
+                AnalysisResult.objects.filter(pk=analysis_result.pk),
+                analysis_search_vector()
+            )
             
             return True
             
         except Exception as e:
-            print(f"\n❌ ANALYSIS FAILED: {e}")
             logger.error(f"Analysis failed: {e}")
             analysis_result.status = AnalysisResult.Status.FAILED
             analysis_result.error_message = str(e)
-            analysis_result.save()
+            analysis_result.save(update_fields=["status", "error_message"])
             return False
     
+    def _log_result(self, checklist_title: str, result: Dict[str, Any]) -> None:
+        """Log a readable summary of an analysis result at DEBUG level."""
+        lines = [
+            f"Analysis results for {checklist_title!r}",
+            f"Compliance status: {str(result.get('compliance_status', 'N/A')).upper()}",
+            f"Compliance score: {result.get('compliance_score', 0) * 100:.1f}%",
+            f"Summary: {result.get('summary', 'No summary available')}",
+        ]
+        for key in ("findings", "recommendations", "gaps", "comments"):
+            items = result.get(key) or []
+            if items:
+                lines.append(f"{key.capitalize()} ({len(items)}):")
+                lines.extend(f"  {i}. {item}" for i, item in enumerate(items[:5], 1))
+        
+        if result.get("control_scores"):
+            lines.append("Control scores:")
+            for control, score in result["control_scores"].items():
+                bar = _SCORE_BARS[min(10, max(0, int(score * 10)))]
+                lines.append(f"  {control}: [{bar}] {score * 100:.0f}%")
+        
+        logger.debug("\n".join(lines))
+    
+    def analyze_many(
+        self,
+        jobs: Sequence[Tuple[Any, List[Dict[str, Any]]]],
+        max_concurrency: int = ANALYZE_MAX_CONCURRENCY,
+    ) -> List[bool]:
+        """
+        Analyze several (analysis_result, document_chunks) pairs concurrently.
+        
+        Each analysis spends almost all of its time waiting on Azure OpenAI,
+        so running them on a small thread pool cuts wall-clock time roughly by
+        the concurrency level without extra CPU.
+        
+        Args:
+            jobs: Pairs of AnalysisResult instance and its document chunks
+            max_concurrency: Maximum number of analyses in flight at once
+            
+        Returns:
+            The ``analyze`` result for each job, in the same order
+        """
+        def run(job):
+            try:
+                return self.analyze(*job)
+            finally:
+                # Worker threads open their own database connections
+                connections.close_all()
+        
+        if len(jobs) <= 1:
+            return [self.analyze(*job) for job in jobs]
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(jobs)))) as pool:
+            return list(pool.map(run, jobs))
+    
+    def _apply_result(self, analysis_result, result: Dict[str, Any]) -> None:
+        """Copy a completed analysis onto the AnalysisResult (without saving)."""
+        from ..models import AnalysisResult
+        
+        analysis_result.compliance_status = result.get("compliance_status")
+        analysis_result.compliance_score = result.get("compliance_score", 0.0)
+        analysis_result.summary = result.get("summary", "")
+        analysis_result.findings = result.get("findings", [])
+        analysis_result.recommendations = result.get("recommendations", [])
+        analysis_result.gaps = result.get("gaps", [])
+        analysis_result.comments = result.get("comments", [])
+        analysis_result.control_scores = result.get("control_scores", {})
+        analysis_result.status = AnalysisResult.Status.COMPLETED
+        analysis_result.completed_at = timezone.now()
+    
+    def _request_json(
+        self,
+        instructions: str,
+        document: str
+    ) -> Dict:
+        """Send the instructions and document to Azure OpenAI and parse its JSON reply."""
+        logger.debug("Calling Azure OpenAI (deployment: %s)", self.azure_deployment)
+        
+        response = self.client.chat.completions.create(
+            model=self.azure_deployment,
+            messages=[
+                {"role": "system", "content": instructions},
+                {
+                    "role": "user",
+                    "content": f"=== DOCUMENT CONTENT TO ANALYZE ===\n{document}"
+                },
+            ],
+            max_completion_tokens=4096,
+            stream=True,
+        )
+        
+        # Read until the JSON object closes rather than the end of the completion
+        raw_output = _read_json_stream(response)
+        
+        logger.debug("Azure OpenAI response received: %d characters", len(raw_output))
+        
+        return _parse_json_output(raw_output)
+    
+    def _result_cache_key(self, instructions: str, document: str) -> str:
+        """Cache key for the Azure OpenAI result of a prompt on this deployment."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.azure_deployment or "", instructions, document):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return f"isoguard:analysis:{digest.hexdigest()}"
+    
     def _analyze_with_azure(
         self,
         content: str,
         checklist_info: Dict,
-        checklist_title: str
+        checklist_title: str,
+        content_lower: Optional[str] = None
     ) -> Dict[str, Any]:
         """Use Azure OpenAI to analyze the document content."""
         
-        controls = checklist_info.get("controls", [])
-        controls_text = "\n".join([f"- {c}" for c in controls])
+        # Fit content within token limits, keeping the passages around checklist keywords
+        truncated_content = _keyword_excerpts(
+            content, checklist_info, MAX_PROMPT_CONTENT_CHARS, content_lower
+        )
         
-        # Get the comprehensive requirements for this checklist
-        requirements = checklist_info.get("requirements", "")
+        # Stable per-checklist instructions first, so the prompt prefix is cached
+        instructions = _audit_instructions(checklist_info.get("id"), checklist_title)
         
-        # Truncate content to fit within token limits
-        max_content_chars = 18000  # Reduced to accommodate requirements
-        truncated_content = content[:max_content_chars]
+        # Identical prompts (same checklist and document excerpt) reuse the earlier result
+        cache_key = self._result_cache_key(instructions, truncated_content)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Using cached Azure OpenAI result for %r", checklist_title)
+            return cached
         
-        prompt = f"""You are an expert ISO 27001:2022 compliance auditor. Analyze the following audit report/document content against the ISO 27001 checklist item: "{checklist_title}".
-
-=== SPECIFIC CONTROLS TO EVALUATE ===
-{controls_text}
-
-=== ISO 27001:2022 REQUIREMENTS AND AUDIT CHECKLIST ===
-{requirements}
-
-=== DOCUMENT CONTENT TO ANALYZE ===
-{truncated_content}
-
-=== ANALYSIS INSTRUCTIONS ===
-Perform a thorough compliance analysis against ALL requirements listed above. For each audit checklist item, determine if the document provides evidence of compliance.
-
-Return ONLY valid JSON with exactly this shape:
-{{
-    "compliance_status": "compliant" | "partial" | "non_compliant" | "not_applicable",
-    "compliance_score": 0.0 to 1.0 (where 1.0 is fully compliant, based on percentage of checklist items satisfied),
-    "summary": "Executive summary of the compliance assessment (2-3 sentences summarizing overall compliance posture)",
-    "findings": [
-        "Specific finding 1 with direct reference to document content that addresses a requirement",
-        "Specific finding 2 indicating what requirement is met and how"
-    ],
-    "recommendations": [
-        "Actionable recommendation 1 to improve compliance",
-        "Actionable recommendation 2 to address specific gaps"
-    ],
-    "gaps": [
-        "Specific requirement from the audit checklist that is NOT addressed in the document",
-        "Another missing requirement with explanation of what should be documented"
-    ],
-    "comments": [
-        "General observation about the audit report quality and completeness",
-        "Comment on documentation thoroughness for this control area",
-        "Suggestions for improving the audit evidence"
-    ],
-    "control_scores": {{
-        "control_name": 0.0 to 1.0,
-        "another_control": 0.0 to 1.0
-    }}
-}}
-
-IMPORTANT GUIDELINES:
-1. Reference the actual document content in your findings
-2. Map gaps directly to the audit checklist items that are not satisfied
-3. Provide practical, actionable recommendations
-4. Score each control individually based on evidence in the document
-5. Be strict in your assessment - only mark items as compliant if there is clear evidence
-6. Consider ISO 27001:2022 specific requirements including new controls"""
-
         try:
-            print(f"   🌐 Calling Azure OpenAI (deployment: {self.azure_deployment})...")
-            
-            response = self.client.chat.completions.create(
-                model=self.azure_deployment,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert ISO 27001 compliance auditor with deep knowledge of information security management systems. Always respond with valid JSON only. Provide detailed, specific, and actionable analysis."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                max_completion_tokens=4096,
-            )
-            
-            print(f"   ✅ Azure OpenAI response received")
-            
-            raw_output = response.choices[0].message.content
-            print(f"   📝 Response length: {len(raw_output)} characters")
-            
-            # Parse JSON response
-            try:
-                result = json.loads(raw_output)
-            except json.JSONDecodeError:
-                # Try to extract JSON from the response if it contains extra text
-                json_match = re.search(r'\{[\s\S]*\}', raw_output)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    raise ValueError(f"LLM returned invalid JSON:\n{raw_output[:500]}")
+            result = self._request_json(instructions, truncated_content)
             
             # Validate and normalize the result
-            return self._normalize_result(result)
+            result = self._normalize_result(result)
+            cache.set(cache_key, result, ANALYSIS_CACHE_TIMEOUT)
+            return result
             
         except Exception as e:
-            print(f"   ❌ Azure OpenAI error: {e}")
-            logger.error(f"Azure OpenAI analysis failed: {e}")
+            logger.error(f"Azure OpenAI analysis failed: {e}. Falling back to mock analysis.")
             # Fall back to mock analysis
-            print(f"   ↩️  Falling back to mock analysis...")
-            return self._analyze_mock(content, checklist_info, checklist_title)
+            return self._analyze_mock(
+                content, checklist_info, checklist_title, content_lower=content_lower
+            )
     
     def _analyze_mock(
         self,
         content: str,
         checklist_info: Dict,
-        checklist_title: str
+        checklist_title: str,
+        content_lower: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Perform mock analysis when Azure OpenAI is not available.
         Uses keyword matching and basic heuristics.
         """
         
-        content_lower = content.lower()
-        keywords = checklist_info.get("keywords", [])
-        controls = checklist_info.get("controls", [])
-        requirements = checklist_info.get("requirements", "")
+        if content_lower is None:
+            content_lower = content.lower()
+        keywords = checklist_info.get("keywords", ())
+        controls = checklist_info.get("controls", ())
+        index = _checklist_index(checklist_info)
+        audit_items = [item for item, _key_terms in index.audit_items]
         
-        # Extract audit checklist items from requirements
-        audit_items = []
-        if requirements:
-            for line in requirements.split('\n'):
-                if line.strip().startswith('□'):
-                    audit_items.append(line.strip()[1:].strip())
+        # Every term looked up below, each searched for only once
+        found_terms = {term for term in index.terms if term in content_lower}
         
         # Count keyword matches
-        keyword_matches = sum(1 for kw in keywords if kw.lower() in content_lower)
+        keyword_hits = [kw in found_terms for kw in index.keywords_lower]
+        keyword_matches = sum(keyword_hits)
         keyword_ratio = keyword_matches / len(keywords) if keywords else 0
         
         # Check audit items coverage
         audit_matches = 0
         audit_gaps = []
-        for item in audit_items:
-            # Extract key terms from audit item
-            key_terms = [word.lower() for word in item.split() if len(word) > 4][:3]
-            if any(term in content_lower for term in key_terms):
+        for item, key_terms in index.audit_items:
+            if any(term in found_terms for term in key_terms):
                 audit_matches += 1
             else:
                 audit_gaps.append(item)
@@ -1137,8 +1487,8 @@ IMPORTANT GUIDELINES:
             compliance_score = 0.0
         
         # Generate findings based on matched keywords
-        matched_keywords = [kw for kw in keywords if kw.lower() in content_lower]
-        missing_keywords = [kw for kw in keywords if kw.lower() not in content_lower]
+        matched_keywords = [kw for kw, hit in zip(keywords, keyword_hits) if hit]
+        missing_keywords = [kw for kw, hit in zip(keywords, keyword_hits) if not hit]
         
         findings = []
         if matched_keywords:
@@ -1156,8 +1506,8 @@ IMPORTANT GUIDELINES:
         if missing_keywords:
             recommendations.append(f"Consider adding documentation for: {', '.join(missing_keywords[:3])}")
         
-        for control in controls[:3]:
-            if not any(word in content_lower for word in control.lower().split()[:3]):
+        for control, words in zip(controls[:3], index.control_words):
+            if not any(word in found_terms for word in words[:3]):
                 gaps.append(f"Control '{control}' may not be adequately addressed")
                 recommendations.append(f"Review and document compliance with '{control}'")
         
@@ -1183,11 +1533,11 @@ IMPORTANT GUIDELINES:
         
         # Generate control scores
         control_scores = {}
-        for control in controls:
+        for control, words in zip(controls, index.control_words):
             control_name = control.split()[0] if control else "Unknown"
             # Simple heuristic: check if control keywords appear in content
-            control_words = control.lower().split()[:4]
-            matches = sum(1 for word in control_words if word in content_lower)
+            control_words = words[:4]
+            matches = sum(1 for word in control_words if word in found_terms)
             control_scores[control_name] = round(matches / max(len(control_words), 1), 2)
         
         return {
@@ -1201,12 +1551,32 @@ IMPORTANT GUIDELINES:
             "control_scores": control_scores,
         }
     
+    def _prefiltered_result(self, checklist_title: str, keyword_coverage: float) -> Dict[str, Any]:
+        """Result for a document skipped by the keyword prefilter."""
+        return {
+            "compliance_status": "not_applicable",
+            "compliance_score": 0.0,
+            "summary": (
+                f"Analysis of '{checklist_title}' skipped: the document covers "
+                f"{keyword_coverage:.0%} of the expected topics, below the "
+                f"{PREFILTER_THRESHOLD:.0%} relevance threshold."
+            ),
+            "findings": [],
+            "recommendations": [
+                "Provide documentation that addresses this checklist item to enable a full assessment."
+            ],
+            "gaps": [],
+            "comments": [
+                "AI analysis was not run because the document does not appear to address this checklist item."
+            ],
+            "control_scores": {},
+        }
+    
     def _normalize_result(self, result: Dict) -> Dict[str, Any]:
         """Normalize and validate the analysis result."""
         
-        valid_statuses = ["compliant", "partial", "non_compliant", "not_applicable"]
         status = result.get("compliance_status", "non_compliant")
-        if status not in valid_statuses:
+        if not isinstance(status, str) or status not in VALID_COMPLIANCE_STATUSES:
             status = "non_compliant"
         
         score = result.get("compliance_score", 0.5)
@@ -6,25 +6,28 @@ It groups paragraphs together until they reach max size, then starts a new chunk
 Perfect for phase 1 - can be upgraded to embedding-based chunking later.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 
 
 @dataclass
 class Chunk:
-    """Represents a semantic chunk of text."""
+    """
+    Represents a semantic chunk of text.
+    
+    Character and word counts are computed once at construction so the
+    processor can hand them straight to ``bulk_create``.
+    """
     content: str
     start_char: int
     end_char: int
     heading: Optional[str] = None
+    char_count: int = field(init=False)
+    word_count: int = field(init=False)
     
-    @property
-    def char_count(self) -> int:
-        return len(self.content)
-    
-    @property
-    def word_count(self) -> int:
-        return len(self.content.split())
+    def __post_init__(self):
+        self.char_count = len(self.content)
+        self.word_count = len(self.content.split())
 
 
 def semantic_chunk(text: str, min_len: int = 300, max_len: int = 1200) -> List[str]:
@@ -44,20 +47,26 @@ def semantic_chunk(text: str, min_len: int = 300, max_len: int = 1200) -> List[s
     """
     paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
     chunks = []
-    current = ""
+    # Collect the paragraphs of the current chunk and track its joined length,
+    # so each chunk is built with a single join instead of repeated concatenation
+    current = [""]
+    current_len = 0
 
     for p in paragraphs:
-        if len(current) + len(p) <= max_len:
-            current += " " + p
+        if current_len + len(p) <= max_len:
+            current.append(p)
+            current_len += 1 + len(p)
         else:
-            if len(current) >= min_len:
-                chunks.append(current.strip())
-                current = p
+            if current_len >= min_len:
+                chunks.append(" ".join(current).strip())
+                current = [p]
+                current_len = len(p)
             else:
-                current += " " + p
+                current.append(p)
+                current_len += 1 + len(p)
 
-    if current:
-        chunks.append(current.strip())
+    if current_len:
+        chunks.append(" ".join(current).strip())
 
     return chunks
 
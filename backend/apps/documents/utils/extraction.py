@@ -4,8 +4,9 @@ Text extraction utilities for PDF, DOCX, and TXT files.
 
 import io
 import logging
+import os
 import re
-from pathlib import Path
+from functools import lru_cache
 from typing import Optional
 
 from PyPDF2 import PdfReader
@@ -180,6 +181,18 @@ def extract_text(file_content: bytes, file_type: str) -> str:
     return extractors[file_type](file_content)
 
 
+# Only PDF is supported for audit reports
+SUPPORTED_FILE_TYPES = frozenset({"pdf"})
+
+
+@lru_cache(maxsize=256)
+def _file_type_for_extension(extension: str) -> Optional[str]:
+    file_type = extension.lstrip(".")
+    if file_type in SUPPORTED_FILE_TYPES:
+        return file_type
+    return None
+
+
 def get_file_type(filename: str) -> Optional[str]:
     """
     Determine file type from filename extension.
@@ -190,12 +203,36 @@ def get_file_type(filename: str) -> Optional[str]:
     Returns:
         File type string or None if unsupported
     """
-    extension = Path(filename).suffix.lower().lstrip(".")
-    
-    # Only PDF is supported for audit reports
-    supported_types = {"pdf"}
+    # Cache on the extension so lookups are shared across filenames
+    return _file_type_for_extension(os.path.splitext(filename)[1].lower())
+
+
+# Leading bytes ("magic numbers") of each supported file type
+FILE_SIGNATURES = {
+    "pdf": b"%PDF",
+}
+
+
+def has_file_signature(file_obj, file_type: str) -> bool:
+    """
+    Check that a file starts with the signature of the given type.
     
-    if extension in supported_types:
-        return extension
+    Only the first few bytes are read and the file position is restored,
+    so large uploads spooled to disk are never loaded into memory here.
     
-    return None
+    Args:
+        file_obj: Open file-like object (e.g. an UploadedFile)
+        file_type: Expected file type
+        
+    Returns:
+        True if the file content matches the expected type
+    """
+    signature = FILE_SIGNATURES.get(file_type)
+    if signature is None:
+        return False
+    position = file_obj.tell()
+    try:
+        file_obj.seek(0)
+        return file_obj.read(len(signature)) == signature
+    finally:
+        file_obj.seek(position)
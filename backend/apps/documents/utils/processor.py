@@ -8,6 +8,7 @@ from django.utils import timezone
 from django.db import transaction
 
 from ..models import Document, DocumentChunk
+from ..search import chunk_search_vector, update_search_vectors
 from .extraction import extract_text, TextExtractionError, get_file_type
 from .chunking import SemanticChunker, Chunk
 
@@ -79,13 +80,16 @@ class DocumentProcessor:
                         start_char=chunk.start_char,
                         end_char=chunk.end_char,
                         heading=chunk.heading,
-                        char_count=chunk.char_count,
                         word_count=chunk.word_count
                     )
                 )
             
-            # Bulk create for efficiency
-            DocumentChunk.objects.bulk_create(chunk_objects)
+            # Bulk create for efficiency (batched to cap query size and memory)
+            DocumentChunk.objects.bulk_create(chunk_objects, batch_size=1000)
+            update_search_vectors(
+                DocumentChunk.objects.filter(document=document),
+                chunk_search_vector()
+            )
             
             # Update document metadata
             document.total_chunks = len(chunks)
@@ -1,12 +1,18 @@
 import logging
 import re
+from functools import partial
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.views import APIView
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
 from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
 
 
 def sanitize_text(text: str) -> str:
@@ -33,14 +39,27 @@ from .serializers import (
     DocumentUploadSerializer,
     DocumentReprocessSerializer,
     AnalyzeRequestSerializer,
+    AnalyzeManyRequestSerializer,
     AnalysisResultSerializer,
     AnalysisResultListSerializer,
 )
+from .pagination import ChunkPagination
 from .utils import DocumentProcessor, get_file_type, DocumentAnalyzer
 from .utils.pdf_report import generate_audit_report_pdf
 
 logger = logging.getLogger(__name__)
 
+# Lifetime of cached document detail payloads (seconds)
+DOCUMENT_CACHE_TIMEOUT = 60 * 60
+
+
+def eager_load(queryset, serializer_class):
+    """Apply the serializer's ``setup_eager_loading`` hook, if it defines one."""
+    setup = getattr(serializer_class, "setup_eager_loading", None)
+    if setup is None:
+        return queryset
+    return setup(queryset)
+
 
 class DocumentViewSet(viewsets.ModelViewSet):
     """
@@ -49,7 +68,8 @@ class DocumentViewSet(viewsets.ModelViewSet):
     Supports:
     - Upload documents (POST /documents/)
     - List documents (GET /documents/)
-    - Retrieve document with chunks (GET /documents/{id}/)
+    - Retrieve document (GET /documents/{id}/, add ?expand=chunks to embed chunk previews)
+    - List a document's chunks, paginated (GET /documents/{id}/chunks/)
     - Delete document (DELETE /documents/{id}/)
     - Reprocess document (POST /documents/{id}/reprocess/)
     """
@@ -81,7 +101,76 @@ class DocumentViewSet(viewsets.ModelViewSet):
         if file_type:
             queryset = queryset.filter(file_type=file_type)
         
-        return queryset.prefetch_related("chunks")
+        return eager_load(queryset, self.get_serializer_class())
+    
+    def _conditional_get(self, request, render, etag, last_modified=None):
+        """
+        Return 304 Not Modified when the client's copy is current, else ``render()``.
+        
+        The ETag includes the rendered format and the ``expand`` parameter so
+        each representation gets its own validator. Responses must always be
+        revalidated, which keeps repeat fetches to a single cheap query.
+        """
+        etag = quote_etag("-".join([
+            etag,
+            request.accepted_renderer.format,
+            request.query_params.get("expand", ""),
+        ]))
+        timestamp = last_modified.timestamp() if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return response
+    
+    def list(self, request, *args, **kwargs):
+        """List documents, honouring If-None-Match."""
+        # Count catches deletions, which do not move the latest timestamp
+        stamp = self.get_queryset().aggregate(count=Count("id"), last=Max("updated_at"))
+        last = stamp["last"].timestamp() if stamp["last"] else 0
+        etag = f"list-{stamp['count']}-{last}"
+        render = partial(super().list, request, *args, **kwargs)
+        return self._conditional_get(request, render, etag)
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a document, honouring If-None-Match / If-Modified-Since."""
+        try:
+            updated_at = self.get_queryset().filter(pk=kwargs["pk"]).values_list(
+                "updated_at", flat=True
+            ).first()
+        except (TypeError, ValueError, ValidationError):
+            updated_at = None
+        if updated_at is None:
+            # Unknown or foreign document: let the normal lookup return 404
+            return super().retrieve(request, *args, **kwargs)
+        etag = f"{kwargs['pk']}-{updated_at.timestamp()}"
+        render = partial(self._cached_retrieve, request, etag, *args, **kwargs)
+        return self._conditional_get(request, render, etag, updated_at)
+    
+    def _cached_retrieve(self, request, version, *args, **kwargs):
+        """
+        Serve the document payload from the cache when possible.
+        
+        The key embeds ``updated_at`` (via ``version``), so any save moves
+        readers to a new key and stale entries simply expire. The host is
+        part of the key because the payload contains absolute URLs.
+        """
+        key = "document:{}:{}:{}".format(
+            version,
+            request.build_absolute_uri("/"),
+            request.query_params.get("expand", ""),
+        )
+        data = cache.get(key)
+        if data is None:
+            response = super().retrieve(request, *args, **kwargs)
+            cache.set(key, response.data, DOCUMENT_CACHE_TIMEOUT)
+            return response
+        return Response(data)
     
     def create(self, request, *args, **kwargs):
         """Upload and process a new document."""
@@ -91,22 +180,20 @@ class DocumentViewSet(viewsets.ModelViewSet):
         uploaded_file = serializer.validated_data["file"]
         
         try:
-            # Get file content
-            file_content = uploaded_file.read()
             file_type = get_file_type(uploaded_file.name)
             
             # Create document record (user is guaranteed authenticated)
             document = Document.objects.create(
                 name=uploaded_file.name,
                 file_type=file_type,
-                file_size=len(file_content),
+                file_size=uploaded_file.size,
                 uploaded_by=request.user,
                 status=Document.Status.PENDING
             )
             
-            # Save the file temporarily
-            from django.core.files.base import ContentFile
-            document.file.save(uploaded_file.name, ContentFile(file_content))
+            # Save the upload directly so it is copied (or moved, when spooled
+            # to a temporary file) in chunks rather than read into memory
+            document.file.save(uploaded_file.name, uploaded_file)
             
             # Process the document
             processor = DocumentProcessor()
@@ -121,7 +208,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
             # Refresh from database
             document.refresh_from_db()
             
-            response_serializer = DocumentSerializer(document)
+            response_serializer = DocumentSerializer(
+                document,
+                context=self.get_serializer_context()
+            )
             
             if success:
                 return Response(
@@ -163,7 +253,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
         success = processor.process(document)
         
         document.refresh_from_db()
-        response_serializer = DocumentSerializer(document)
+        response_serializer = DocumentSerializer(
+            document,
+            context=self.get_serializer_context()
+        )
         
         if success:
             return Response(response_serializer.data)
@@ -175,18 +268,14 @@ class DocumentViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=["get"])
     def chunks(self, request, pk=None):
-        """Get all chunks for a document with full content."""
+        """Get a page of chunks for a document with full content."""
         document = self.get_object()
-        chunks = document.chunks.all()
+        chunks = DocumentChunk.objects.filter(document=document)
         
-        # Pagination
-        page = self.paginate_queryset(chunks)
-        if page is not None:
-            serializer = DocumentChunkSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = DocumentChunkSerializer(chunks, many=True)
-        return Response(serializer.data)
+        paginator = ChunkPagination()
+        page = paginator.paginate_queryset(chunks, request, view=self)
+        serializer = DocumentChunkSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     def destroy(self, request, *args, **kwargs):
         """Delete a document and all its chunks."""
@@ -209,6 +298,7 @@ class DocumentChunkViewSet(viewsets.ReadOnlyModelViewSet):
     
     queryset = DocumentChunk.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ChunkPagination
     
     def get_serializer_class(self):
         if self.action == "list":
@@ -229,7 +319,48 @@ class DocumentChunkViewSet(viewsets.ReadOnlyModelViewSet):
         if search:
             queryset = queryset.filter(content__icontains=search)
         
-        return queryset.select_related("document")
+        # The listing loads only the columns it renders; neither chunk
+        # serializer reads the parent document, so no select_related.
+        if self.action == "list":
+            queryset = queryset.with_preview()
+        
+        return queryset
+
+
+def _load_analysis_input(user, file_names):
+    """
+    Return the user's processed documents with the given names and their chunks.
+    
+    Chunks are read in one streamed query, documents newest first, and
+    returned as the dicts ``DocumentAnalyzer.analyze`` expects.
+    """
+    # Find documents by name (only user's own documents)
+    documents = list(Document.objects.filter(
+        name__in=file_names,
+        status=Document.Status.COMPLETED,
+        uploaded_by=user
+    ))
+    
+    logger.debug("Found %d processed document(s)", len(documents))
+    
+    if not documents:
+        return documents, []
+    
+    chunk_rows = DocumentChunk.objects.filter(
+        document__in=[doc.pk for doc in documents]
+    ).order_by(
+        "-document__uploaded_at", "document_id", "chunk_index"
+    ).values_list("content", "heading", "document__name")
+    
+    document_chunks = []
+    for content, heading, document_name in chunk_rows.iterator(chunk_size=200):
+        # Sanitize content to remove any invalid Unicode chars
+        document_chunks.append({
+            "content": sanitize_text(content),
+            "heading": sanitize_text(heading) if heading else None,
+            "document_name": document_name,
+        })
+    return documents, document_chunks
 
 
 class AnalyzeView(APIView):
@@ -244,8 +375,6 @@ class AnalyzeView(APIView):
     
     def post(self, request):
         """Analyze uploaded documents against a specific checklist."""
-        print("\n[ANALYZE] Request received")
-        
         serializer = AnalyzeRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
@@ -253,41 +382,20 @@ class AnalyzeView(APIView):
         checklist_title = serializer.validated_data["checklist_title"]
         file_names = serializer.validated_data["files"]
         
-        print(f"[ANALYZE] Checklist ID: {checklist_id}")
-        print(f"[ANALYZE] Checklist Title: {checklist_title}")
-        print(f"[ANALYZE] Files: {file_names}")
+        logger.debug(
+            "Analyze request: checklist %s (%r), files %s",
+            checklist_id, checklist_title, file_names
+        )
         
         try:
-            # Find documents by name (only user's own documents)
-            documents = Document.objects.filter(
-                name__in=file_names,
-                status=Document.Status.COMPLETED,
-                uploaded_by=request.user
-            )
-            
-            print(f"[ANALYZE] Found {documents.count()} processed document(s)")
+            documents, document_chunks = _load_analysis_input(request.user, file_names)
             
-            if not documents.exists():
-                print("[ANALYZE] ERROR: No processed documents found")
+            if not documents:
                 return Response(
                     {"error": "No processed documents found with the given file names"},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Get all chunks from the documents
-            document_chunks = []
-            for doc in documents:
-                chunks = doc.chunks.all()
-                for chunk in chunks:
-                    # Sanitize content to remove any invalid Unicode chars
-                    content = sanitize_text(chunk.content)
-                    heading = sanitize_text(chunk.heading) if chunk.heading else None
-                    document_chunks.append({
-                        "content": content,
-                        "heading": heading,
-                        "document_name": doc.name,
-                    })
-            
             if not document_chunks:
                 return Response(
                     {"error": "No document chunks found to analyze"},
@@ -330,6 +438,77 @@ class AnalyzeView(APIView):
             )
 
 
+class AnalyzeManyView(APIView):
+    """
+    API endpoint for analyzing several ISO 27001 checklists in one request.
+    
+    POST /documents/analyze-many/
+    
+    Each checklist is analyzed against its own files, and the analyses run
+    concurrently (see ``DocumentAnalyzer.analyze_many``). The response lists
+    one entry per requested checklist, in request order: the analysis result,
+    or ``{"checklist_id", "error"}`` when there was nothing to analyze.
+    
+    The response is sent once every analysis has finished, so it takes
+    roughly ceil(N / ANALYZE_MAX_CONCURRENCY) model calls; the dashboard
+    posts to ``analyze/`` per checklist instead.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser]
+    
+    def post(self, request):
+        """Analyze uploaded documents against several checklists."""
+        serializer = AnalyzeManyRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        entries = []
+        jobs = []
+        try:
+            for item in serializer.validated_data["analyses"]:
+                documents, document_chunks = _load_analysis_input(request.user, item["files"])
+                if not document_chunks:
+                    entries.append({
+                        "checklist_id": item["checklist_id"],
+                        "error": "No processed documents found with the given file names"
+                        if not documents else "No document chunks found to analyze",
+                    })
+                    continue
+                
+                analysis_result = AnalysisResult.objects.create(
+                    checklist_id=item["checklist_id"],
+                    checklist_title=item["checklist_title"],
+                    status=AnalysisResult.Status.PENDING,
+                    analyzed_by=request.user
+                )
+                analysis_result.documents.set(documents)
+                entries.append(analysis_result)
+                jobs.append((analysis_result, document_chunks))
+            
+            DocumentAnalyzer().analyze_many(jobs)
+            
+            results = []
+            for entry in entries:
+                if isinstance(entry, AnalysisResult):
+                    entry.refresh_from_db()
+                    entry = AnalysisResultSerializer(entry).data
+                results.append(entry)
+            
+            return Response({"results": results}, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Analysis failed: {e}")
+            # Don't leave the analyses created for this request pending
+            AnalysisResult.objects.filter(
+                pk__in=[analysis_result.pk for analysis_result, _chunks in jobs],
+                status__in=[AnalysisResult.Status.PENDING, AnalysisResult.Status.PROCESSING]
+            ).update(status=AnalysisResult.Status.FAILED, error_message=str(e))
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class AnalysisResultViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoints for viewing analysis results.
@@ -366,7 +545,7 @@ class AnalysisResultViewSet(viewsets.ReadOnlyModelViewSet):
         if compliance_status:
             queryset = queryset.filter(compliance_status=compliance_status)
         
-        return queryset.prefetch_related("documents")
+        return eager_load(queryset, self.get_serializer_class())
 
 
 class ExportAuditReportView(APIView):
@@ -386,8 +565,6 @@ class ExportAuditReportView(APIView):
         """Generate and download a PDF audit report."""
         from django.core.files.base import ContentFile
         
-        print("\n[EXPORT] PDF Report generation requested")
-        
         # Get query parameters
         checklist_ids_param = request.query_params.get("checklist_ids", "")
         organization_name = request.query_params.get("organization", "Organization")
@@ -429,7 +606,7 @@ class ExportAuditReportView(APIView):
             if checklist_ids and len(checklist_ids) == 1 and not regenerate:
                 result = latest_results.get(checklist_ids[0])
                 if result and result.pdf_report:
-                    print(f"[EXPORT] Serving stored PDF for checklist {checklist_ids[0]}")
+                    logger.debug("Serving stored PDF for checklist %s", checklist_ids[0])
                     response = HttpResponse(result.pdf_report.read(), content_type='application/pdf')
                     filename = f"ISOGUARD_{result.checklist_title.replace(' ', '_')}.pdf"
                     response['Content-Disposition'] = f'attachment; filename="{filename}"'
@@ -453,12 +630,12 @@ class ExportAuditReportView(APIView):
                     "control_scores": result.control_scores or {},
                 })
             
-            print(f"[EXPORT] Generating PDF for {len(analysis_data)} checklist(s)")
+            logger.debug("Generating PDF for %d checklist(s)", len(analysis_data))
             
             # Generate PDF
             pdf_bytes = generate_audit_report_pdf(analysis_data, organization_name)
             
-            print(f"[EXPORT] PDF generated successfully ({len(pdf_bytes)} bytes)")
+            logger.debug("PDF generated (%d bytes)", len(pdf_bytes))
             
             # Save PDF to AnalysisResult for single checklist
             if checklist_ids and len(checklist_ids) == 1:
@@ -468,7 +645,7 @@ class ExportAuditReportView(APIView):
                     short_id = str(result.id)[:8]
                     filename = f"report_{result.checklist_id}_{short_id}.pdf"
                     result.pdf_report.save(filename, ContentFile(pdf_bytes), save=True)
-                    print(f"[EXPORT] PDF saved to AnalysisResult {result.id}")
+                    logger.debug("PDF saved to AnalysisResult %s", result.id)
             
             # Create HTTP response with PDF
             response = HttpResponse(pdf_bytes, content_type='application/pdf')
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 # -------------------------------------------------
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # MUST be high
+    "apps.core.middleware.MaxRequestSizeMiddleware",  # before anything reads the body
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -124,6 +125,23 @@ else:
         }
     }
 
+# -------------------------------------------------
+# CACHE (local memory for development, Redis when REDIS_URL is set)
+# -------------------------------------------------
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # -------------------------------------------------
 # PASSWORD VALIDATION
 # -------------------------------------------------
@@ -151,6 +169,18 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads larger than 512KB are streamed to a temporary file instead of
+# being held in memory (documents can be up to 50MB)
+FILE_UPLOAD_MAX_MEMORY_SIZE = 512 * 1024
+FILE_UPLOAD_HANDLERS = [
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+# Requests declaring a larger body are rejected with 413 before it is read
+# (50MB document limit plus headroom for multipart encoding)
+MAX_REQUEST_BYTES = 51 * 1024 * 1024
+
 # -------------------------------------------------
 # DEFAULT PRIMARY KEY
 # -------------------------------------------------
@@ -166,6 +196,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 from datetime import timedelta
@@ -4,6 +4,9 @@ import logo from "../../assets/Logo.jpg";
 import { logout, getCurrentUser } from "../../utils/auth";
 import api from "../../utils/api";
 
+// Checklist analyses "Analyze All" runs at the same time
+const ANALYZE_ALL_CONCURRENCY = 4;
+
 const checklists = [
   { 
     id: 1, 
@@ -730,8 +733,9 @@ export default function Dashboard() {
     const results = [];
 
     try {
-      // Analyze each checklist that has files
-      for (const checklist of checklistsWithFiles) {
+      // Analyze each checklist that has files, a few requests at a time, so
+      // every checklist shows its own progress and result as it finishes
+      const analyzeChecklist = async (checklist) => {
         setAnalyzing((prev) => ({ ...prev, [checklist.id]: true }));
         
         try {
@@ -751,7 +755,17 @@ export default function Dashboard() {
         } finally {
           setAnalyzing((prev) => ({ ...prev, [checklist.id]: false }));
         }
-      }
+      };
+
+      const queue = [...checklistsWithFiles];
+      const worker = async () => {
+        while (queue.length > 0) {
+          await analyzeChecklist(queue.shift());
+        }
+      };
+      await Promise.all(
+        Array.from({ length: Math.min(ANALYZE_ALL_CONCURRENCY, queue.length) }, worker)
+      );
 
       // Summary of results
       const successful = results.filter((r) => r.success).length;